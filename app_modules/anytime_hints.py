@@ -0,0 +1,35 @@
+import numpy as np
+import time
+
+# Function to order guesses from most to least promising using their opening entropies (guesses not in the table go last)
+def get_guess_order(guess_words, opening_entropies):
+    opening_ranks = {word: rank for rank, word in enumerate(opening_entropies)}  # Table is stored best first
+    return np.argsort([opening_ranks.get(word, len(opening_ranks)) for word in guess_words], kind="stable")
+
+# Function to score guesses block by block until a deadline, yielding (best guess index, best score, guesses scored, total guesses)
+# The first yield comes before any scoring (best score None), so a caller always has an answer however early the deadline is
+# guess_indices should be in the order to try them; win_bonus_indices get 1/n added, as a guess that is a candidate can win outright
+def generate_anytime_hints(pattern_matrix, candidate_indices, guess_indices, deadline, win_bonus_indices=None, max_block_entries=1 << 18):
+    num_candidates = len(candidate_indices)
+    best_index, best_score = int(guess_indices[0]), None
+    yield best_index, best_score, 0, len(guess_indices)
+
+    bonus_mask = None
+    if win_bonus_indices is not None and num_candidates > 0:
+        bonus_mask = np.zeros(len(pattern_matrix.guess_words), dtype=bool)
+        bonus_mask[win_bonus_indices] = True
+
+    # Small blocks keep the time between deadline checks to a few milliseconds
+    block_size = max(1, max_block_entries // max(1, num_candidates))
+    for start in range(0, len(guess_indices), block_size):
+        if time.monotonic() >= deadline:
+            return
+        block_guess_indices = guess_indices[start:start + block_size]
+        scores = pattern_matrix.calculate_expected_information_batch(candidate_indices, block_guess_indices)
+        if bonus_mask is not None:
+            scores = scores + bonus_mask[block_guess_indices] / num_candidates
+
+        block_best = int(np.argmax(scores))  # First maximum, so ties keep the more promising guess
+        if best_score is None or scores[block_best] > best_score:
+            best_index, best_score = int(block_guess_indices[block_best]), float(scores[block_best])
+        yield best_index, best_score, min(start + block_size, len(guess_indices)), len(guess_indices)
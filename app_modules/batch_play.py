@@ -0,0 +1,163 @@
+from game_session import GameSession, GUESS_ACCEPTED, MAX_ATTEMPTS
+from database_system import DatabaseConnection, PlayerDatabase, StatsWriteBehindQueue
+from wordle_bot import EntropyMaximisationAgent
+from word_lexicon import get_possible_answers_lexicon, get_allowed_words_lexicon
+import argparse
+import random
+import json
+import time
+import sys
+
+HINT_COMMAND = "generate guess"  # Same text the player types in the terminal game
+DEFAULT_PASSWORD = "batch-play"
+
+# Replay log format, one JSON object per line:
+#     {"user": "alice", "password": "optional", "target": "optional", "hard_mode": false, "guesses": ["crane", "generate guess", "moist"]}
+# Games without a target get a random one, so only logs with targets replay exactly
+# A record that cannot be played gets an error result line (e.g. {"error": "invalid_target"}) and the replay carries on
+
+# Class to stand in for a replay log line that is not valid JSON, so it is reported like any other unplayable record
+class InvalidReplayLine:
+    def __init__(self, line_number, message):
+        self.line_number = line_number
+        self.message = message
+
+# Function to read replay records from a JSONL file (blank lines are skipped, lines that are not JSON become InvalidReplayLine)
+def read_replay_log(file):
+    for line_number, line in enumerate(file, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                yield InvalidReplayLine(line_number, str(error))
+
+# Function to check a replay record can be played, returning the error for its result line (None if it is valid)
+def get_record_error(record):
+    if not isinstance(record, dict) or not isinstance(record.get("user"), str) or not isinstance(record.get("password", DEFAULT_PASSWORD), str):
+        return "invalid_record"
+    if not isinstance(record.get("guesses"), list) or not all(isinstance(guess, str) for guess in record["guesses"]):
+        return "invalid_guesses"
+    target_word = record.get("target")
+    if target_word is not None and (not isinstance(target_word, str) or target_word.strip().lower() not in get_allowed_words_lexicon()):
+        return "invalid_target"
+    return None
+
+# Class to play scripted games headlessly against a real PlayerDatabase
+class BatchPlayer:
+    def __init__(self, player_db, max_bot_guesses=3, login_every_game=False):
+        self.player_db = player_db
+        self.max_bot_guesses = max_bot_guesses
+        self.login_every_game = login_every_game  # Include the password check in every game (slow by design) instead of once per user
+        self.entropy_bot = EntropyMaximisationAgent(use_strategy_tree=True)  # Shared by every game; sessions only hold their own state
+        self.hard_mode_entropy_bot = None  # Created on the first hard-mode game, as its hints must follow the hard-mode rules
+        self.player_ids = {}
+
+    # Method to log a user in, creating the account on first sight (returns None if the password is wrong)
+    # Only successful logins are remembered, so a record with a wrong password does not lock the user out of later records
+    def get_player_id(self, username, password):
+        if username in self.player_ids and not self.login_every_game:
+            return self.player_ids[username]
+        player_id = self.player_db.verify_login(username, password)
+        if player_id is None and not self.player_db.check_player_exists(username):
+            player_id = self.player_db.add_player(username, password)
+        if player_id is not None:
+            self.player_ids[username] = player_id
+        return player_id
+
+    # Method to play one scripted game, returning a result record
+    def play_record(self, record):
+        if isinstance(record, InvalidReplayLine):
+            return {"error": "invalid_json", "line": record.line_number, "message": record.message}
+        record_error = get_record_error(record)
+        if record_error is not None:
+            return {"user": record.get("user") if isinstance(record, dict) else None, "error": record_error}
+
+        username = record["user"]
+        player_id = self.get_player_id(username, record.get("password", DEFAULT_PASSWORD))
+        if player_id is None:
+            return {"user": username, "error": "login_failed"}
+
+        hard_mode = bool(record.get("hard_mode", False))
+        if hard_mode and self.hard_mode_entropy_bot is None:
+            self.hard_mode_entropy_bot = EntropyMaximisationAgent(use_strategy_tree=True, hard_mode=True)
+        entropy_bot = self.hard_mode_entropy_bot if hard_mode else self.entropy_bot
+        target_word = record["target"].strip().lower() if record.get("target") is not None else None  # Guesses are lowercased too
+        session = GameSession(player_id, self.player_db, target_word, self.max_bot_guesses, entropy_bot, hard_mode)
+        rejected_guesses = 0
+        for guess in record["guesses"]:
+            if session.finished:
+                break
+            if guess.strip().lower() == HINT_COMMAND:
+                session.request_hint()
+            elif session.submit_guess(guess)[0] != GUESS_ACCEPTED:
+                rejected_guesses += 1
+
+        # Games the log leaves unfinished are reported but not recorded, as if the player quit
+        result = {"user": username, "target": session.target_word, "hard_mode": hard_mode, "finished": session.finished, "won": session.won}
+        result.update({"attempts": session.attempts, "hints_used": session.bot_guesses_used, "rejected_guesses": rejected_guesses})
+        return result
+
+    # Method to play every record, streaming one JSON result line per game, and return (games played, seconds taken)
+    def play_records(self, records, output=None):
+        games_played = 0
+        start_time = time.perf_counter()
+        for record in records:
+            result = self.play_record(record)
+            games_played += 1
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+        self.player_db.flush_player_stats()
+        return games_played, time.perf_counter() - start_time
+
+# Function to generate a replay log of solver-played games, for use as synthetic load
+def generate_replay_log(num_games, num_users, seed=0):
+    random_generator = random.Random(seed)
+    possible_answers = get_possible_answers_lexicon().words
+    entropy_bot = EntropyMaximisationAgent(use_strategy_tree=True)
+    for _ in range(num_games):
+        session = GameSession(target_word=random_generator.choice(possible_answers), max_bot_guesses=MAX_ATTEMPTS, entropy_bot=entropy_bot)
+        guesses = []
+        while not session.finished:
+            guesses.append(session.request_hint())
+            session.submit_guess(guesses[-1])
+        yield {"user": f"player{random_generator.randrange(num_users)}", "target": session.target_word, "guesses": guesses}
+
+# Function to run the batch player from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Play scripted games from a JSONL replay log against the player database, headlessly.")
+    parser.add_argument("replay_log", nargs="?", help="JSONL file of games to play (default: stdin)")
+    parser.add_argument("--db", default="batch_play.db", help="database file to play against")
+    parser.add_argument("--output", help="file to stream JSON result lines to (default: stdout)")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    parser.add_argument("--write-behind", action="store_true", help="batch stats writes through a StatsWriteBehindQueue")
+    parser.add_argument("--login-every-game", action="store_true", help="verify the password for every game, not once per user")
+    parser.add_argument("--generate", type=int, metavar="GAMES", help="write a solver-played replay log of this many games to the output and exit")
+    parser.add_argument("--users", type=int, default=100, help="number of distinct users in a generated log")
+    args = parser.parse_args()
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.generate is not None:
+            for record in generate_replay_log(args.generate, args.users):
+                output.write(json.dumps(record) + "\n")
+            return
+
+        db_conn = DatabaseConnection(args.db)
+        write_behind_queue = StatsWriteBehindQueue(args.db) if args.write_behind else None
+        batch_player = BatchPlayer(PlayerDatabase(db_conn, write_behind_queue), login_every_game=args.login_every_game)
+        replay_log = open(args.replay_log) if args.replay_log else sys.stdin
+        try:
+            games_played, seconds = batch_player.play_records(read_replay_log(replay_log), None if args.quiet else output)
+        finally:
+            if write_behind_queue is not None:
+                write_behind_queue.close()
+            db_conn.close()
+            if args.replay_log:
+                replay_log.close()
+        print(f"Games played: {games_played} in {seconds:.2f}s ({games_played / seconds:.1f} games/s)", file=sys.stderr)
+    finally:
+        if args.output:
+            output.close()
+
+if __name__ == "__main__":
+    main()
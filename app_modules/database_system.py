@@ -1,5 +1,8 @@
 from colorama import Fore, Style
+from password_hashing import PasswordHasher
 import sqlite3
+import threading
+import queue
 import time
 
 # Function to change the color of text in the terminal
@@ -22,41 +25,168 @@ def change_text_style(text, style):
     if style == "BOLD":
         return Style.BRIGHT + text + Style.RESET_ALL
 
-# Function to generate a random number (linear congruential generator)
-def generate_random_number(multiplier, increment, modulus):
-    seed = int(time.time() * 1000)  # Generate "random" seed value
-    random_number = (multiplier * seed + increment) % modulus
-    return random_number
-
-# Function to generate a random string of characters to serve as a salt
-def generate_random_salt(salt_length=32):
-    salt = []
-    multiplier = 1103515245
-    increment = 12345
-    modulus = 2**32  # Salt must be 32 bits long
-    for _ in range(salt_length):
-        random_byte = generate_random_number(multiplier, increment, modulus) & 0xFF
-        salt.append(chr(random_byte))  # Convert byte to character
-    return ''.join(salt)
-
-# Function to hash a password using a simple hashing function with a salt
-def hash_password(password):
-    salt = generate_random_salt()  # Generate a random salt
-    salted_password = salt + password
-    hash_value = 0
-
-    # Hashing mechanism using character encoding and bitwise operations
-    for char in salted_password:
-        hash_value = (hash_value * 31 + ord(char)) & 0xFFFFFFFF
-        hash_value ^= (hash_value >> 16) | (hash_value << 16)
-
-    hashed_password = format(hash_value, '08x')  # Convert hash value to hexadecimal string
-    return salt, hashed_password
+# Password hasher used when a PlayerDatabase is not given its own
+default_password_hasher = PasswordHasher()
+
+# Function to hash a password with a random salt, returning (salt, stored hash)
+def hash_password(password, password_hasher=default_password_hasher):
+    return password_hasher.hash_password(password)
+
+# Atomic per-game stats update (increments are applied by SQLite, so concurrent writers cannot lose updates)
+# The materialised leaderboard score is recalculated from the new totals in the same statement
+UPDATE_PLAYER_STATS_SQL = '''
+    UPDATE players SET
+        win_points = win_points + :win_points,
+        loss_points = loss_points + :loss_points,
+        total_games = total_games + 1,
+        total_attempts = total_attempts + :attempts,
+        attempt_average = CAST(total_attempts + :attempts AS REAL) / (total_games + 1),
+        leaderboard_score = calculate_leaderboard_score(
+            win_points + :win_points, loss_points + :loss_points, total_games + 1,
+            CAST(total_attempts + :attempts AS REAL) / (total_games + 1)
+        )
+    WHERE id = :player_id
+'''
+
+# Function to calculate the leaderboard score for a player (also registered as a SQL function on every connection)
+def calculate_leaderboard_score(win_points, loss_points, total_games, attempt_average):
+    if total_games == 0:
+        return 0  # Return 0 if no games have been played
+    
+    base_score = win_points * 100
+    win_percentage = win_points / total_games
+    attempts_multiplier = max(1, (7 - attempt_average) / 2)  # Higher multiplier for fewer attempts
+    loss_penalty = min(0.3, loss_points / total_games)  # Penalty for losses
+    leaderboard_score = base_score * win_percentage * attempts_multiplier * (1 - loss_penalty)
+    return round(leaderboard_score)
+
+# Valid settings for PRAGMA synchronous (how hard SQLite works to make each commit durable)
+SYNCHRONOUS_MODES = ["OFF", "NORMAL", "FULL", "EXTRA"]
+
+# Function to open a SQLite connection tuned for concurrent players (WAL journal, busy timeout, cached prepared statements)
+def open_connection(db_name, synchronous="NORMAL", check_same_thread=True):
+    if synchronous not in SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid synchronous mode: {synchronous}")
+    conn = sqlite3.connect(db_name, timeout=5.0, cached_statements=256, check_same_thread=check_same_thread)
+    conn.execute('PRAGMA journal_mode=WAL')  # Readers no longer block the writer (and vice versa)
+    conn.execute(f'PRAGMA synchronous={synchronous}')
+    conn.create_function('calculate_leaderboard_score', 4, calculate_leaderboard_score, deterministic=True)
+    return conn
+
+# Function to calculate the win/loss points a game is worth
+def calculate_game_points(won, bot_guesses_used):
+    win_points = 0
+    loss_points = 0
+    if won:
+        if bot_guesses_used == 0:
+            win_points = 1
+        else:
+            win_points = (1 / bot_guesses_used + 1)
+    else:
+        if bot_guesses_used == 0:
+            loss_points = 1
+        else:
+            loss_points = bot_guesses_used
+    return win_points, loss_points
+
+# Function to build the parameters for UPDATE_PLAYER_STATS_SQL from a game result
+def get_player_stats_parameters(player_id, won, attempts, bot_guesses_used):
+    win_points, loss_points = calculate_game_points(won, bot_guesses_used)
+    return {"win_points": win_points, "loss_points": loss_points, "attempts": attempts, "player_id": player_id}
+
+# Class to mark a flush() call's place in the write-behind queue
+class FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None  # Set if the results queued before this request could not be written
+
+# Class to batch game results in a background thread and write each batch in one transaction
+class StatsWriteBehindQueue:
+    def __init__(self, db_name, flush_interval_ms=50, max_batch_size=500, synchronous="NORMAL", max_write_attempts=3, retry_delay=0.1):
+        self.db_name = db_name
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.synchronous = synchronous  # "FULL" makes each batch durable against power loss, "NORMAL" against crashes only
+        self.max_write_attempts = max_write_attempts  # Tries per batch before its results are kept back for the next batch
+        self.retry_delay = retry_delay
+        self.pending_results = queue.Queue()
+        self.writer_conn = None  # Only used by the writer thread
+        self.unwritten_results = []  # Results whose batch failed to commit, retried with the next batch
+        self.write_error = None  # Error from the last batch (None once a batch commits)
+        self.writer_thread = threading.Thread(target=self.run_writer, daemon=True)
+        self.writer_thread.start()
+
+    # Method to queue a game result to be written with the next batch
+    def add_result(self, player_id, won, attempts, bot_guesses_used):
+        self.pending_results.put(get_player_stats_parameters(player_id, won, attempts, bot_guesses_used))
+
+    # Method to block until every result queued so far has been committed (raises the database error if they could not be)
+    def flush(self):
+        flush_request = FlushRequest()
+        self.pending_results.put(flush_request)
+        flush_request.done.wait()
+        if flush_request.error is not None:
+            raise flush_request.error
+
+    # Method to write any remaining results and stop the writer thread (raises the database error if some could not be written)
+    def close(self):
+        self.pending_results.put(None)
+        self.writer_thread.join()
+        if self.unwritten_results:
+            raise self.write_error
+
+    # Method to commit results in one transaction, retrying while the database is busy (returns the error if every attempt failed)
+    def write_results(self, results):
+        for attempt in range(self.max_write_attempts):
+            try:
+                if self.writer_conn is None:
+                    self.writer_conn = open_connection(self.db_name, self.synchronous, check_same_thread=False)
+                with self.writer_conn:  # Rolled back on error, so a failed batch can be retried whole
+                    self.writer_conn.executemany(UPDATE_PLAYER_STATS_SQL, results)
+                return None
+            except sqlite3.Error as error:
+                write_error = error
+                if attempt + 1 < self.max_write_attempts:
+                    time.sleep(self.retry_delay * (attempt + 1))
+        return write_error
+
+    # Method run by the writer thread: collects results for up to one flush interval, then commits them together
+    def run_writer(self):
+        running = True
+        while running:
+            batch = [self.pending_results.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch_size and batch[-1] is not None and not isinstance(batch[-1], FlushRequest):
+                try:
+                    batch.append(self.pending_results.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            results = self.unwritten_results + [item for item in batch if isinstance(item, dict)]
+            write_error = None
+            try:
+                if results:
+                    write_error = self.write_results(results)
+            except Exception as error:
+                write_error = error
+            finally:
+                # Failed results are kept rather than dropped, and every waiting flush() is released with the error
+                self.unwritten_results = results if write_error is not None else []
+                self.write_error = write_error
+                for item in batch:
+                    if item is None:
+                        running = False
+                    elif isinstance(item, FlushRequest):
+                        item.error = write_error
+                        item.done.set()
+        if self.writer_conn is not None:
+            self.writer_conn.close()
 
 # Class to manage the database connection and structure
 class DatabaseConnection:
-    def __init__(self, db_name='wordleplus.db'):
-        self.conn = sqlite3.connect(db_name)
+    def __init__(self, db_name='wordleplus.db', synchronous="NORMAL"):
+        self.db_name = db_name
+        self.conn = open_connection(db_name, synchronous)
         self.c = self.conn.cursor()
         self.create_tables()  # Ensure required tables are created upon initialization
 
@@ -73,9 +203,19 @@ class DatabaseConnection:
                 loss_points REAL DEFAULT 0.0,
                 total_games INTEGER DEFAULT 0,
                 total_attempts INTEGER DEFAULT 0,
-                attempt_average REAL DEFAULT 0.0
+                attempt_average REAL DEFAULT 0.0,
+                leaderboard_score REAL DEFAULT 0.0
             )
         ''')
+
+        # Add the materialised leaderboard score to databases created before it existed
+        self.c.execute('PRAGMA table_info(players)')
+        if 'leaderboard_score' not in [column[1] for column in self.c.fetchall()]:
+            self.c.execute('ALTER TABLE players ADD COLUMN leaderboard_score REAL DEFAULT 0.0')
+            self.c.execute('UPDATE players SET leaderboard_score = calculate_leaderboard_score(win_points, loss_points, total_games, attempt_average)')
+
+        # Index used for top-N pages and rank lookups (ties are ranked by account age)
+        self.c.execute('CREATE INDEX IF NOT EXISTS players_leaderboard_score_index ON players (leaderboard_score DESC, id)')
         self.conn.commit()
 
     # Method to close the database connection
@@ -84,13 +224,15 @@ class DatabaseConnection:
 
 # Class to manage player-related operations in the database
 class PlayerDatabase:
-    def __init__(self, db_conn):
+    def __init__(self, db_conn, write_behind_queue=None, password_hasher=default_password_hasher):
         self.db_conn = db_conn
         self.c = self.db_conn.c  # Use the cursor from the database connection
+        self.password_hasher = password_hasher
+        self.write_behind_queue = write_behind_queue  # Optional StatsWriteBehindQueue for batched stats writes
 
     # Method to add a new player to the database
     def add_player(self, username, password):
-        salt, hashed_password = hash_password(password)  # Hash the player's password
+        salt, hashed_password = hash_password(password, self.password_hasher)  # Hash the player's password
         self.c.execute('SELECT id FROM players WHERE username = ?', (username,))  # Check if username already exists
         if self.c.fetchone() is None:
             self.c.execute('INSERT INTO players (username, password, salt) VALUES (?, ?, ?)', (username, hashed_password, salt))
@@ -110,88 +252,86 @@ class PlayerDatabase:
         if result:
             stored_password, stored_salt, player_id = result
 
-            # Recreate the salted password hash to compare with the stored e
-            salted_input_password = stored_salt + password
-            hash_value = 0
-            for char in salted_input_password:
-                hash_value = (hash_value * 31 + ord(char)) & 0xFFFFFFFF
-                hash_value ^= (hash_value >> 16) | (hash_value << 16)
-            input_hash = format(hash_value, '08x')
-
-            if input_hash == stored_password:
+            if self.password_hasher.verify_password(password, stored_salt, stored_password):
+                # Transparently upgrade legacy hashes and hashes made with old cost settings
+                if self.password_hasher.needs_rehash(stored_password):
+                    new_salt, new_hashed_password = self.password_hasher.hash_password(password)
+                    self.c.execute('UPDATE players SET password = ?, salt = ? WHERE id = ?', (new_hashed_password, new_salt, player_id))
+                    self.db_conn.conn.commit()
                 return player_id  # Return player ID if credentials are valid
         return None  # Return None if credentials are invalid
 
     # Method delete a player's account from the database
     def delete_account(self, player_id):
+        self.flush_player_stats()  # Queued results must not be written after the row is gone
         self.c.execute('DELETE FROM players WHERE id = ?', (player_id,))
         self.db_conn.conn.commit()
 
-    # Method to update a player's game statistics in the database
+    # Method to update a player's game statistics in the database (queued if the database has a write-behind queue)
     def update_player_stats(self, player_id, won, attempts, bot_guesses_used):
-        self.c.execute('SELECT win_points, loss_points, total_games, total_attempts, attempt_average FROM players WHERE id = ?', (player_id,))
-        player_data = self.c.fetchone()
-        win_points, loss_points, total_games, total_attempts, attempt_average = player_data
-
-        # Update points based on whether the player won or lost
-        if won:
-            if bot_guesses_used == 0:
-                win_points += 1
-            else:
-                win_points += (1 / bot_guesses_used + 1)
-        else:
-            if bot_guesses_used == 0:
-                loss_points += 1
-            else:
-                loss_points += bot_guesses_used
-        
-        total_games += 1  # Increment the number of games played
-        total_attempts += attempts  # Calculate the total attempts so far
-
-        if total_games > 0:
-            attempt_average = total_attempts / total_games  # Recalculate the average attempts per game
-        else:
-            attempt_average = 0
-        self.c.execute(
-            'UPDATE players SET win_points = ?, loss_points = ?, total_games = ?, total_attempts = ?, attempt_average = ? WHERE id = ?',
-            (win_points, loss_points, total_games, total_attempts, attempt_average, player_id)
-        )
+        if self.write_behind_queue is not None:
+            self.write_behind_queue.add_result(player_id, won, attempts, bot_guesses_used)
+            return
+        self.c.execute(UPDATE_PLAYER_STATS_SQL, get_player_stats_parameters(player_id, won, attempts, bot_guesses_used))
         self.db_conn.conn.commit()
 
+    # Method to wait until any queued game results have been written
+    def flush_player_stats(self):
+        if self.write_behind_queue is not None:
+            self.write_behind_queue.flush()
+
     # Method to calculate the leaderboard score for a player
     def calculate_leaderboard_score(self, win_points, loss_points, total_games, attempt_average):
-        if total_games == 0:
-            return 0  # Return 0 if no games have been played
-        
-        base_score = win_points * 100
-        win_percentage = win_points / total_games
-        attempts_multiplier = max(1, (7 - attempt_average) / 2)  # Higher multiplier for fewer attempts
-        loss_penalty = min(0.3, loss_points / total_games)  # Penalty for losses
-        leaderboard_score = base_score * win_percentage * attempts_multiplier * (1 - loss_penalty)
-        return round(leaderboard_score)
-
-    # Method to generate a leaderboard message displaying player rankings
-    def get_leaderboard_message(self):
-        self.c.execute('SELECT username, win_points, loss_points, total_games, attempt_average FROM players')
-        leaderboard = self.c.fetchall()
+        return calculate_leaderboard_score(win_points, loss_points, total_games, attempt_average)
+
+    # Method to count the players on the leaderboard
+    def get_player_count(self):
+        self.c.execute('SELECT COUNT(*) FROM players')
+        return self.c.fetchone()[0]
+
+    # Method to get one page of the leaderboard as (rank, username, win_points, loss_points, total_games, attempt_average, score) rows
+    def get_leaderboard_page(self, page=1, page_size=10):
+        self.flush_player_stats()  # Include any queued results
+        offset = (page - 1) * page_size
+        self.c.execute('''
+            SELECT username, win_points, loss_points, total_games, attempt_average, leaderboard_score
+            FROM players ORDER BY leaderboard_score DESC, id LIMIT ? OFFSET ?
+        ''', (page_size, offset))
+        return [(offset + i + 1, *row) for i, row in enumerate(self.c.fetchall())]
+
+    # Method to get a player's leaderboard rank without reading every player (None if the player does not exist)
+    def get_player_rank(self, player_id):
+        self.flush_player_stats()
+        self.c.execute('SELECT leaderboard_score FROM players WHERE id = ?', (player_id,))
+        result = self.c.fetchone()
+        if result is None:
+            return None
+        score = result[0]
+        self.c.execute(
+            'SELECT COUNT(*) FROM players WHERE leaderboard_score > ? OR (leaderboard_score = ? AND id < ?)',
+            (score, score, player_id)
+        )
+        return self.c.fetchone()[0] + 1
+
+    # Method to generate a leaderboard message displaying one page of player rankings (and the player's own rank, if given)
+    def get_leaderboard_message(self, page=1, page_size=10, player_id=None):
+        leaderboard = self.get_leaderboard_page(page, page_size)
         if not leaderboard:
             return change_text_colour("No players available on the leaderboard yet.\n", "RED")
 
-        # Calculate scores for all players and sort them
-        scored_leaderboard = [
-            (username, win_points, loss_points, total_games, attempt_average, self.calculate_leaderboard_score(win_points, loss_points, total_games, attempt_average))
-            for username, win_points, loss_points, total_games, attempt_average in leaderboard
-        ]
-        scored_leaderboard.sort(key=lambda x: x[5], reverse=True)
         # Format the leaderboard into a message
-        leaderboard_message = ""
-        for rank, (username, win_points, loss_points, total_games, attempt_average, score) in enumerate(scored_leaderboard, start=1):
-            leaderboard_message += (
+        leaderboard_lines = []
+        for rank, username, win_points, loss_points, total_games, attempt_average, score in leaderboard:
+            leaderboard_lines.append(
                 f"\n    {rank}. {username}: "
-                f"{change_text_colour(f'Leaderboard Score: {score}', 'GREEN')}" + " | "
+                f"{change_text_colour(f'Leaderboard Score: {round(score)}', 'GREEN')}" + " | "
                 f"{change_text_colour(f'Win Pts.: {round(win_points, 1)}', 'CYAN')}" + " | "
                 f"{change_text_colour(f'Loss Pts.: {round(loss_points, 1)}', 'RED')}" + " | "
                 f"{change_text_colour(f'Total Games: {total_games}', 'YELLOW')}" + " | "
                 f"{change_text_colour(f'Avg. Attempts: {round(attempt_average, 1)}', 'GREY')}\n"
             )
-        return leaderboard_message
+        if player_id is not None:
+            player_rank = self.get_player_rank(player_id)
+            if player_rank is not None:
+                leaderboard_lines.append(f"\n    Your rank: {player_rank} of {self.get_player_count()}\n")
+        return "".join(leaderboard_lines)
@@ -1,7 +1,9 @@
 from colorama import Fore, Style
-from wordle_bot import EntropyMaximisationAgent 
+from game_session import GameSession, MultiBoardSession, GUESS_WRONG_LENGTH, GUESS_NOT_ALLOWED, GUESS_BREAKS_HARD_MODE, MAX_WORD_LENGTH, MAX_ATTEMPTS, HINT_TIME_BUDGET, DEFAULT_NUM_BOARDS
+from word_feedback import get_feedback_code, decode_pattern_code
+from word_lexicon import get_possible_answers_lexicon
+from terminal_renderer import TerminalRenderer
 import time
-import sys
 
 # Function to change colour of text in the terminal
 def change_text_colour(text, colour):
@@ -23,21 +25,6 @@ def change_text_style(text, style):
     if style == "BOLD":
         return Style.BRIGHT + text + Style.RESET_ALL
 
-# Function to convert text file with possible answers list into an array
-def load_possible_answers(file_name):
-    with open(file_name, 'r') as file:
-        possible_answers = [line.strip() for line in file.readlines()]
-    return possible_answers
-
-# Function to convert text file with allowed words list into an array
-def load_allowed_words(file_name):
-    with open(file_name, 'r') as file:
-        allowed_words = [line.strip() for line in file.readlines()]
-    return allowed_words
-
-POSSIBLE_ANSWERS = load_possible_answers("data/possible_answers.txt")
-ALLOWED_WORDS = load_allowed_words("data/allowed_words.txt")
-
 # Function to generate a random number (linear congruential generator)
 def generate_random_number(multiplier, increment, modulus):
     seed = int(time.time() * 1000)  # Generate "random" seed value
@@ -46,56 +33,37 @@ def generate_random_number(multiplier, increment, modulus):
 
 # Function to choose a random target word
 def choose_target_word():
-    random_index = generate_random_number(1663, 123, len(POSSIBLE_ANSWERS))
-    target_word = POSSIBLE_ANSWERS[random_index]
+    possible_answers = get_possible_answers_lexicon().words
+    random_index = generate_random_number(1663, 123, len(possible_answers))
+    target_word = possible_answers[random_index]
     return target_word
 
+# Colours used to display each tile of a coded guess pattern
+TILE_COLOURS = {"G": "GREEN", "Y": "YELLOW", "B": "GREY"}
+
 # Function to return a coloured guess pattern after a particular guess
 def get_guess_pattern(guess, target_word):
-
-    # All letters in guess pattern initially set to grey
-    guess_pattern = [change_text_colour(letter, "GREY") for letter in guess.upper()]
-    target_word = list(target_word)
-
-    # First pass (checks for letters that are in the word and are in the correct spot)
-    for i in range(len(guess)):
-        if guess[i] == target_word[i]:
-            guess_pattern[i] = change_text_colour(guess[i].upper(), "GREEN")
-            target_word[i] = None
-
-    # Second pass (checks for letters that are in the word but are not in the correct spot)
-    for i in range(len(guess)):
-        if Fore.GREEN not in guess_pattern[i] and guess[i] in target_word:
-            guess_pattern[i] = change_text_colour(guess[i].upper(), "YELLOW")
-            target_word[target_word.index(guess[i])] = None
-
+    coded_guess_pattern = decode_pattern_code(get_feedback_code(guess, target_word))
+    guess_pattern = [change_text_colour(letter, TILE_COLOURS[tile]) for letter, tile in zip(guess.upper(), coded_guess_pattern)]
     guess_pattern = " ".join(guess_pattern)
     return guess_pattern
 
-# Funtion to draw a border (used for game grid and on-screen keyboard)
-def draw_border(lines, content_width=9, space_width=1):
+# Function to build the lines of a border around some content (used for game grid and on-screen keyboard)
+def build_border_lines(lines, content_width=9, space_width=1):
     top_border = "┌" + "─" * (content_width + space_width * 2) + "┐"
     bottom_border = "└" + "─" * (content_width + space_width * 2) + "┘"
     space = " " * space_width
-    print(top_border)
-    for line in lines:
-        print("│" + space + line + space + "│")
-    print(bottom_border)
-
-MAX_WORD_LENGTH = 5
-MAX_ATTEMPTS = 6
-
-# Function to display game grid
-def display_game_grid(guess_pattern_list):
-    lines = []
-    for guess_pattern in guess_pattern_list:
-        lines.append(guess_pattern)
-    while len(lines) < MAX_ATTEMPTS:
+    return [top_border] + ["│" + space + line + space + "│" for line in lines] + [bottom_border]
+
+# Function to build the lines of the game grid
+def build_game_grid_lines(guess_pattern_list, num_rows=MAX_ATTEMPTS):
+    lines = list(guess_pattern_list)
+    while len(lines) < num_rows:
         lines.append(" ".join(["_"] * MAX_WORD_LENGTH))
-    draw_border(lines, content_width=MAX_WORD_LENGTH * 2 - 1, space_width=1)
+    return build_border_lines(lines, content_width=MAX_WORD_LENGTH * 2 - 1, space_width=1)
 
-# Function to draw keyboard
-def draw_keyboard(key_colors):
+# Function to build the lines of the on-screen keyboard
+def build_keyboard_lines(key_colors):
     keyboard_layout = [
         ["Q", "W", "E", "R", "T", "Y", "U", "I", "O", "P"],
         ["A", "S", "D", "F", "G", "H", "J", "K", "L"],
@@ -110,175 +78,192 @@ def draw_keyboard(key_colors):
     for row_index, row_keys in enumerate(keyboard_layout):
         formatted_keys = [change_text_colour(key, key_colors.get(key, "WHITE")) for key in row_keys]
         keyboard_rows.append(row_formats[row_index].format(*formatted_keys))
-    draw_border(keyboard_rows, content_width=23, space_width=1)
+    return build_border_lines(keyboard_rows, content_width=23, space_width=1)
+
+# Function to build one frame of the game screen (grid and keyboard together, so it can be written at once)
+def build_game_frame(guess_pattern_list, key_colors):
+    return build_game_grid_lines(guess_pattern_list) + build_keyboard_lines(key_colors) + [""]
+
+# Function to build one frame of a multi-board game (every board's grid side by side, then the keyboard)
+def build_multi_board_frame(board_pattern_lists, key_colors, num_rows):
+    grids = [build_game_grid_lines(guess_pattern_list, num_rows) for guess_pattern_list in board_pattern_lists]
+    return ["  ".join(grid_lines) for grid_lines in zip(*grids)] + build_keyboard_lines(key_colors) + [""]
+
+# Ranking of keyboard colours, a key only ever changes to a more informative colour
+KEY_COLOUR_RANKS = {"GREY": 0, "YELLOW": 1, "GREEN": 2}
 
 # Function to update the colours of letters on the on-screen keyboard
 def update_keyboard_colors(guess, target_word, key_colors):
-    target_word_list = list(target_word)
-
-    # First pass (checks for letters that are in the word and are in the correct spot)
-    for i, letter in enumerate(guess):
-        if guess[i] == target_word[i]:
-            key_colors[letter.upper()] = "GREEN"
-            target_word_list[i] = None
-
-    # Second pass (checks for letters that are in the word but are not in the correct spot)
-    for i, letter in enumerate(guess):
-        if letter.upper() not in key_colors:
-            if letter in target_word_list:
-                key_colors[letter.upper()] = "YELLOW"
-                target_word_list[target_word_list.index(letter)] = None
-            else:  # If letter is not in the word, then change letter colour to grey
-                key_colors[letter.upper()] = "GREY"
-
-# Function to output text in the terminal like a typewriter
-def typewriter_effect(text, delay=0.05):
-    result = ""
-    for char in text:
-        sys.stdout.write(char)
-        sys.stdout.flush()
-        time.sleep(delay)
-        result += char
-    return result
-
-# Function to perform a binary search on an array
-def binary_search(array, lower_index, upper_index, target_item):
-
-    # Base case (target is not found)
-    if lower_index > upper_index:
-        return -1
-    
-    # Search for target item
-    middle_index = (upper_index + lower_index) // 2
-    if array[middle_index] == target_item:
-        return middle_index
-    elif array[middle_index] > target_item:
-        return binary_search(array, lower_index, middle_index - 1, target_item)
-    elif array[middle_index] < target_item:
-        return binary_search(array, middle_index + 1, upper_index, target_item)
+    coded_guess_pattern = decode_pattern_code(get_feedback_code(guess, target_word))
+    for letter, tile in zip(guess.upper(), coded_guess_pattern):
+        tile_colour = TILE_COLOURS[tile]
+        if letter not in key_colors or KEY_COLOUR_RANKS[tile_colour] > KEY_COLOUR_RANKS[key_colors[letter]]:
+            key_colors[letter] = tile_colour
+
+# Function to create a callback that shows the best guess found so far on one line while a hint is generated
+def create_hint_progress_callback(renderer, min_interval=0.1):
+    last_update_time = 0.0
+    def show_hint_progress(best_guess, best_score, guesses_scored, total_guesses):
+        nonlocal last_update_time
+        if time.monotonic() - last_update_time < min_interval and guesses_scored < total_guesses:
+            return
+        last_update_time = time.monotonic()
+        renderer.write("\r" + change_text_colour(f"Best so far: {best_guess.upper()} ({guesses_scored}/{total_guesses} words checked)", "GREY"))
+    return show_hint_progress
 
 # Function to run the main game loop
-def play_game(player_id, player_db, max_bot_guesses=3):
-    target_word = choose_target_word()  # Select a random target word for the player to guess
-    guess = None
-    target_word_guessed = False
-    attempts = 0
-    bot_guesses_used = 0
+def play_game(player_id, player_db, max_bot_guesses=3, renderer=None, hard_mode=False):
+    renderer = renderer or TerminalRenderer()  # Buffered output; animation is skippable and off when not on a terminal
+    session = GameSession(player_id, player_db, choose_target_word(), max_bot_guesses, hard_mode=hard_mode)  # Holds the game state, this function only handles terminal I/O
     guess_pattern_list = []  # Stores feedback patterns for each guess
     key_colors = {}  # Tracks the colour-coded status of letters on the virtual keyboard
-    entropy_bot = EntropyMaximisationAgent()
-    possible_guesses = ALLOWED_WORDS
 
     # Introduction and tutorial section
-    print(change_text_style("NEW GAME\n", "BOLD"))
-    typewriter_effect(f"Hello, I'm {change_text_colour('Lexi', 'CYAN')} the Wordle bot!\n\n")
-    typewriter_effect("I'll be guiding you through this Wordle game. Let's see how quickly you can guess the word!\n\n")
+    renderer.write(change_text_style("NEW GAME (HARD MODE)\n" if hard_mode else "NEW GAME\n", "BOLD") + "\n")
+    renderer.typewriter(f"Hello, I'm {change_text_colour('Lexi', 'CYAN')} the Wordle bot!\n\n")
+    renderer.typewriter("I'll be guiding you through this Wordle game. Let's see how quickly you can guess the word!\n\n")
     
     while True:
         try:
             # Prompt player to decide if they want a tutorial
-            typewriter_effect("Would you like me to explain how to play? (y/n): ")
-            display_rules = input().strip().lower()
-            print()
+            display_rules = renderer.read_input("Would you like me to explain how to play? (y/n): ").strip().lower()
+            renderer.write("\n")
             if display_rules not in ["y", "n"]:
                 raise ValueError(change_text_colour("Invalid input. Please enter 'y' or 'n'.\n", "RED"))
             
             # Show tutorial if player agrees
             if display_rules == "y":
-                typewriter_effect("How To Play:\n\n")
-                typewriter_effect("    • You have six attempts to guess a five-letter word.\n\n")
-                typewriter_effect("    • The colour of a letter will show you how close your guess was.\n\n")
-                typewriter_effect(f"    • If the letter is {change_text_colour('green', 'GREEN')}, the letter is in the word and in the correct spot.\n\n")
-                typewriter_effect(f"    • If the letter is {change_text_colour('yellow', 'YELLOW')}, the letter is in the word but in the wrong spot.\n\n")
-                typewriter_effect(f"    • If the letter is {change_text_colour('grey', 'BLACK')}, the letter is not in the word at all.\n\n")
-                typewriter_effect(f"    • By typing {change_text_colour('generate guess', 'CYAN')}, I'll find the best possible guess based on remaining words and display it.\n\n")
-                typewriter_effect("    • You are allowed three generated guesses per game.\n\n")
-                typewriter_effect(f"    • Using them will affect the amount of {change_text_colour('win', 'GREEN')}/{change_text_colour('loss', 'RED')} points you receive, so use them wisely!\n\n")
+                renderer.typewriter("How To Play:\n\n")
+                renderer.typewriter("    • You have six attempts to guess a five-letter word.\n\n")
+                renderer.typewriter("    • The colour of a letter will show you how close your guess was.\n\n")
+                renderer.typewriter(f"    • If the letter is {change_text_colour('green', 'GREEN')}, the letter is in the word and in the correct spot.\n\n")
+                renderer.typewriter(f"    • If the letter is {change_text_colour('yellow', 'YELLOW')}, the letter is in the word but in the wrong spot.\n\n")
+                renderer.typewriter(f"    • If the letter is {change_text_colour('grey', 'GREY')}, the letter is not in the word at all.\n\n")
+                renderer.typewriter(f"    • By typing {change_text_colour('generate guess', 'CYAN')}, I'll find the best possible guess based on remaining words and display it.\n\n")
+                renderer.typewriter("    • You are allowed three generated guesses per game.\n\n")
+                renderer.typewriter(f"    • Using them will affect the amount of {change_text_colour('win', 'GREEN')}/{change_text_colour('loss', 'RED')} points you receive, so use them wisely!\n\n")
+                if hard_mode:
+                    renderer.typewriter(f"    • In {change_text_colour('hard mode', 'RED')}, green letters must stay in place and yellow letters must be used in every later guess.\n\n")
             
             # Start the game after tutorial
-            typewriter_effect("Okay, let's begin the game!\n\n")
+            renderer.typewriter("Okay, let's begin the game!\n\n")
             break
 
         except ValueError as e:
-            print(f"\n{e}")
+            renderer.write(f"\n{e}\n")
             continue
 
     # Display the initial game grid and keyboard
-    display_game_grid(guess_pattern_list)
-    draw_keyboard(key_colors)
-
-    print()
+    renderer.write_frame(build_game_frame(guess_pattern_list, key_colors))
 
     # Main game loop, continues until player runs out of attempts or guesses the word
-    while attempts < MAX_ATTEMPTS and not target_word_guessed:
-        valid_guess = False
-        while not valid_guess:
-
-            # Show remaining bot guesses if any are available
-            if bot_guesses_used < max_bot_guesses:
-                print(change_text_colour(f"Generated guesses remaining: {max_bot_guesses - bot_guesses_used} (type 'generate guess' to use hint)\n", "GREY"))
-
-            # Prompt player to enter a guess
-            prompt_text = f"Attempt {attempts + 1}. Enter a 5-letter word: "
-            guess = input(prompt_text).lower().strip()
-            print()
-
-            # Handle bot-generated guess request
-            if guess == "generate guess":
-                if bot_guesses_used < max_bot_guesses:
-                    bot_guesses_used += 1
-                    if attempts == 0:
-                        suggested_guess = "tares"  # Predefined first guess for optimization
-                    else:
-                        typewriter_effect(change_text_colour("Generating guess. One moment please...\n", "CYAN")) 
-                        print()
-                        suggested_guess = entropy_bot.choose_best_guess(entropy_bot.generate_expected_information_dictionary(possible_guesses))  # Generate a guess based on entropy maximization
-                    print(change_text_colour(f"Suggested guess: {suggested_guess.upper()}\n", "YELLOW"))
-                else:
-                    print(change_text_colour("No remaining bot guesses available.\n", "RED"))  # Notify player if no bot guesses are available
-                continue
-
-            # Validate player's guess
-            if len(guess) != MAX_WORD_LENGTH:
-                print(change_text_colour("Please enter a 5-letter word.\n", "RED"))
-            elif binary_search(ALLOWED_WORDS, 0, len(ALLOWED_WORDS) - 1, guess) == -1:
-                print(change_text_colour("Word not in allowed word list. Try again.\n", "RED"))
+    while not session.finished:
+
+        # Show remaining bot guesses if any are available
+        if session.can_use_hint():
+            renderer.write(change_text_colour(f"Generated guesses remaining: {max_bot_guesses - session.bot_guesses_used} (type 'generate guess' to use hint)\n", "GREY") + "\n")
+
+        # Prompt player to enter a guess
+        prompt_text = f"Attempt {session.attempts + 1}. Enter a 5-letter word: "
+        guess = renderer.read_input(prompt_text).lower().strip()
+        renderer.write("\n")
+
+        # Handle bot-generated guess request
+        if guess == "generate guess":
+            if session.can_use_hint():
+                progress_callback = None
+                if session.get_precomputed_hint() is None:
+                    renderer.write(change_text_colour("Generating guess. One moment please...\n", "CYAN") + "\n")
+                    progress_callback = create_hint_progress_callback(renderer)
+                suggested_guess = session.request_hint(HINT_TIME_BUDGET, progress_callback)  # Strategy tree / opening book if possible, otherwise a search with a deadline
+                if progress_callback is not None:
+                    renderer.write("\n\n")
+                renderer.write(change_text_colour(f"Suggested guess: {suggested_guess.upper()}\n", "YELLOW") + "\n")
             else:
-                valid_guess = True  # Mark guess as valid
+                renderer.write(change_text_colour("No remaining bot guesses available.\n", "RED") + "\n")  # Notify player if no bot guesses are available
+            continue
+
+        # Validate player's guess
+        outcome, _ = session.submit_guess(guess)
+        if outcome == GUESS_WRONG_LENGTH:
+            renderer.write(change_text_colour("Please enter a 5-letter word.\n", "RED") + "\n")
+            continue
+        elif outcome == GUESS_NOT_ALLOWED:
+            renderer.write(change_text_colour("Word not in allowed word list. Try again.\n", "RED") + "\n")
+            continue
+        elif outcome == GUESS_BREAKS_HARD_MODE:
+            renderer.write(change_text_colour(f"Hard mode: {session.get_hard_mode_violation(guess)}. Try again.\n", "RED") + "\n")
+            continue
 
         # Generate feedback for the guess
-        guess_pattern = get_guess_pattern(guess, target_word)
+        guess_pattern = get_guess_pattern(guess, session.target_word)
         guess_pattern_list.append(guess_pattern)  # Add feedback to the game grid
 
         # Update and display the game grid and keyboard colors
-        display_game_grid(guess_pattern_list)
-        update_keyboard_colors(guess, target_word, key_colors)
-        draw_keyboard(key_colors)
-        print()
-
-        # Check if the guess matches the target word
-        if guess == target_word:
-            print(change_text_colour("Congratulations! You've guessed the word!\n", "GREEN"))
-            target_word_guessed = True
-
-            # Update player's stats in the database
-            player_db.update_player_stats(player_id, True, attempts + 1, bot_guesses_used)
-            
-            break
+        update_keyboard_colors(guess, session.target_word, key_colors)
+        renderer.write_frame(build_game_frame(guess_pattern_list, key_colors))
 
-        # Filter possible guesses based on the feedback pattern
-        coded_pattern = entropy_bot.get_coded_guess_pattern(guess, target_word)
-        possible_guesses = [
-            word for word in possible_guesses
-            if entropy_bot.get_coded_guess_pattern(guess, word) == coded_pattern
-        ]
-
-        attempts += 1
+    # Player's stats are recorded by the session when the game ends
+    if session.won:
+        renderer.write(change_text_colour("Congratulations! You've guessed the word!\n", "GREEN") + "\n")
 
     # Handle case where player uses all attempts without guessing the word
-    if not target_word_guessed:
-        print(change_text_colour("Sorry, you've used all your attempts.\n", "RED")) 
-        print("The word was " + change_text_colour(str(target_word), "GREEN") + ".\n")
+    else:
+        renderer.write(change_text_colour("Sorry, you've used all your attempts.\n", "RED") + "\n") 
+        renderer.write("The word was " + change_text_colour(str(session.target_word), "GREEN") + ".\n\n")
+
+# Function to run a multi-board game, where every guess is played on all the boards still to be solved
+def play_multi_board_game(num_boards=DEFAULT_NUM_BOARDS, max_bot_guesses=3, renderer=None):
+    renderer = renderer or TerminalRenderer()
+    session = MultiBoardSession(num_boards=num_boards, max_bot_guesses=max_bot_guesses)
+    board_pattern_lists = [[] for _ in range(num_boards)]  # Feedback patterns for each board, up to the guess that solved it
+    key_colors = {}  # Keys show their most informative colour across the unsolved boards
+
+    renderer.write(change_text_style(f"NEW {num_boards}-BOARD GAME\n", "BOLD") + "\n")
+    renderer.typewriter(f"Every guess is played on all {num_boards} boards at once. Solve them all within {session.max_attempts} attempts!\n\n")
+    renderer.typewriter(f"Type {change_text_colour('generate guess', 'CYAN')} and I'll pick the guess that tells us the most across every board.\n\n")
+    renderer.write_frame(build_multi_board_frame(board_pattern_lists, key_colors, session.max_attempts))
+
+    while not session.finished:
+        if session.can_use_hint():
+            renderer.write(change_text_colour(f"Generated guesses remaining: {max_bot_guesses - session.bot_guesses_used} (type 'generate guess' to use hint)\n", "GREY") + "\n")
+
+        guess = renderer.read_input(f"Attempt {session.attempts + 1}/{session.max_attempts}. Enter a 5-letter word: ").lower().strip()
+        renderer.write("\n")
+
+        if guess == "generate guess":
+            if session.can_use_hint():
+                progress_callback = None
+                if session.get_precomputed_hint() is None:
+                    renderer.write(change_text_colour("Generating guess. One moment please...\n", "CYAN") + "\n")
+                    progress_callback = create_hint_progress_callback(renderer)
+                suggested_guess = session.request_hint(HINT_TIME_BUDGET, progress_callback)  # Searched with a deadline unless it needs no search
+                if progress_callback is not None:
+                    renderer.write("\n\n")
+                renderer.write(change_text_colour(f"Suggested guess: {suggested_guess.upper()}\n", "YELLOW") + "\n")
+            else:
+                renderer.write(change_text_colour("No remaining bot guesses available.\n", "RED") + "\n")
+            continue
+
+        unsolved_boards = session.get_unsolved_boards()
+        outcome, _ = session.submit_guess(guess)
+        if outcome == GUESS_WRONG_LENGTH:
+            renderer.write(change_text_colour("Please enter a 5-letter word.\n", "RED") + "\n")
+            continue
+        elif outcome == GUESS_NOT_ALLOWED:
+            renderer.write(change_text_colour("Word not in allowed word list. Try again.\n", "RED") + "\n")
+            continue
 
-        # Update player's stats in the database for a loss
-        player_db.update_player_stats(player_id, False, 6, bot_guesses_used)
\ No newline at end of file
+        for board in unsolved_boards:
+            board_pattern_lists[board].append(get_guess_pattern(guess, session.target_words[board]))
+        key_colors = {}
+        for board in session.get_unsolved_boards():
+            for previous_guess, _ in session.guess_history:
+                update_keyboard_colors(previous_guess, session.target_words[board], key_colors)
+        renderer.write_frame(build_multi_board_frame(board_pattern_lists, key_colors, session.max_attempts))
+
+    if session.won:
+        renderer.write(change_text_colour(f"Congratulations! You've solved all {num_boards} boards in {session.attempts} attempts!\n", "GREEN") + "\n")
+    else:
+        renderer.write(change_text_colour("Sorry, you've used all your attempts.\n", "RED") + "\n")
+        renderer.write("The words were " + ", ".join(change_text_colour(word, "GREEN") for word in session.target_words) + ".\n\n")
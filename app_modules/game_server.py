@@ -0,0 +1,187 @@
+from game_session import GameSession, GUESS_ACCEPTED, HINT_TIME_BUDGET
+from word_feedback import decode_pattern_code
+from wordle_bot import get_pattern_matrix
+from hint_service import HintService
+from solve_cache import SolveCache
+from wordle_bot import EntropyMaximisationAgent
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import json
+import time
+
+MAX_LINE_LENGTH = 1024
+HINT_DEADLINE_GRACE = 0.25  # Extra seconds allowed for queueing and transfer before a process-pool hint falls back
+HINT_PROGRESS_INTERVAL = 0.1  # Minimum seconds between streamed hint progress lines
+
+# Line protocol (one command per line, one JSON object per response line):
+#     GUESS <word>   submit a guess
+#     HINT           use a generated guess (searches stream {"event": "hint_progress", ...} lines before the hint)
+#     STATS          hint service and solve cache metrics (only when hints run on a process pool or use a solve cache)
+#     NEW [HARD]     abandon the current game and start a new one (in hard mode with HARD)
+#     QUIT           close the connection
+
+# Function to describe the state of a session for a response
+def describe_session(session):
+    state = {
+        "attempts": session.attempts,
+        "hints_left": session.max_bot_guesses - session.bot_guesses_used,
+        "finished": session.finished,
+        "hard_mode": session.hard_mode,
+    }
+    if session.finished:
+        state["won"] = session.won
+        state["target_word"] = session.target_word
+    return state
+
+# Function to create a callback that streams hint progress to a client from a worker thread
+def create_hint_progress_callback(loop, writer):
+    last_update_time = 0.0
+    def send_hint_progress(best_guess, best_score, guesses_scored, total_guesses):
+        nonlocal last_update_time
+        if time.monotonic() - last_update_time < HINT_PROGRESS_INTERVAL:
+            return
+        last_update_time = time.monotonic()
+        progress = {"event": "hint_progress", "best": best_guess, "checked": guesses_scored, "total": total_guesses}
+        loop.call_soon_threadsafe(writer.write, (json.dumps(progress) + "\n").encode())
+    return send_hint_progress
+
+# Class to host many concurrent game sessions over TCP in one process
+class GameServer:
+    def __init__(self, hint_workers=4, session_factory=GameSession, hint_service=None, hint_time_budget=HINT_TIME_BUDGET, solve_cache=None):
+        self.hint_executor = ThreadPoolExecutor(max_workers=hint_workers)  # Hints run off the event loop, so one player's search never stalls the others
+        self.hint_service = hint_service  # Optional process pool for searches, so hints can use every core
+        self.hint_time_budget = hint_time_budget  # Every hint is answered within about this many seconds
+        self.session_factory = session_factory
+        self.active_sessions = 0
+        self.entropy_bots = None
+        if solve_cache is not None:
+            # Sessions share one agent per mode, so every game's searches fill (and hit) the same solve cache
+            self.entropy_bots = {hard_mode: EntropyMaximisationAgent(use_strategy_tree=True, solve_cache=solve_cache, hard_mode=hard_mode) for hard_mode in (False, True)}
+
+    # Method to create a game session, on the shared agents if the server has a solve cache
+    def create_session(self, hard_mode=False):
+        if self.entropy_bots is None:
+            return self.session_factory(hard_mode=hard_mode)
+        return self.session_factory(hard_mode=hard_mode, entropy_bot=self.entropy_bots[hard_mode])
+
+    # Method to get the server's metrics for the STATS command (None if there is nothing to report)
+    def get_metrics(self):
+        metrics = {}
+        if self.hint_service is not None:
+            metrics.update(self.hint_service.get_metrics())
+        if self.entropy_bots is not None:
+            metrics["solve_cache"] = self.entropy_bots[False].get_solve_cache_stats()
+        return metrics or None
+
+    # Method to save the solve cache to its file (if the server has one)
+    def save_solve_cache(self):
+        if self.entropy_bots is not None:
+            self.entropy_bots[False].save_solve_cache()
+
+    # Method to run a deadline-bounded hint request on the worker pool (or the hint service, if there is one)
+    async def request_hint(self, session, writer):
+        if self.hint_service is None:
+            loop = asyncio.get_running_loop()
+            progress_callback = create_hint_progress_callback(loop, writer)
+            deadline = time.monotonic() + self.hint_time_budget  # Time spent waiting for a free thread counts against the budget
+            return await loop.run_in_executor(self.hint_executor, lambda: session.request_hint(max(0.0, deadline - time.monotonic()), progress_callback))
+
+        hint = session.get_precomputed_hint()
+        if hint is None:
+            try:
+                hint = await self.hint_service.choose_guess_from_mask_async(
+                    session.candidate_mask, self.hint_time_budget, self.hint_time_budget + HINT_DEADLINE_GRACE
+                )
+            except asyncio.TimeoutError:
+                # The pool is backed up: answer with the most promising unscored guess rather than keep the player waiting
+                hint = session.entropy_bot.choose_guess_with_deadline(session.candidate_mask, 0)
+        return session.use_hint(hint)
+
+    # Method to handle one command line, returning the response object and whether to keep the connection open
+    async def handle_command(self, session, line, writer):
+        command, _, argument = line.strip().partition(" ")
+        command = command.upper()
+
+        if command == "GUESS":
+            outcome, pattern_code = session.submit_guess(argument)
+            response = {"outcome": outcome}
+            if outcome == GUESS_ACCEPTED:
+                response["pattern"] = "".join(decode_pattern_code(pattern_code))
+            response.update(describe_session(session))
+            return response, True
+        if command == "HINT":
+            if not session.can_use_hint():
+                return {"error": "no_hints_left"}, True
+            return {"hint": await self.request_hint(session, writer), **describe_session(session)}, True
+        metrics = self.get_metrics() if command == "STATS" else None
+        if metrics is not None:
+            return {"active_sessions": self.active_sessions, **metrics}, True
+        if command == "QUIT":
+            return {"event": "bye"}, False
+        return {"error": "unknown_command"}, True
+
+    # Method to serve one client connection
+    async def handle_client(self, reader, writer):
+        self.active_sessions += 1
+        session = self.create_session()
+        try:
+            writer.write((json.dumps({"event": "new_game", **describe_session(session)}) + "\n").encode())
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line or len(line) > MAX_LINE_LENGTH:
+                    break
+                line = line.decode(errors="replace")
+                if line.strip().upper() in ("NEW", "NEW HARD"):
+                    session = self.create_session(hard_mode=line.strip().upper() == "NEW HARD")
+                    response, keep_open = {"event": "new_game", **describe_session(session)}, True
+                else:
+                    response, keep_open = await self.handle_command(session, line, writer)
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+                if not keep_open:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+
+    # Method to start listening (returns the asyncio server)
+    async def start(self, host="127.0.0.1", port=8765):
+        get_pattern_matrix()  # Map the pattern matrix before accepting players
+        return await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE_LENGTH * 2, backlog=1024)
+
+# Function to run the game server from the command line
+# With a solve cache file, the cache is loaded at startup and saved on shutdown (by each worker process when hints run on a process pool)
+async def run_server(host, port, hint_workers, hint_processes, hint_time_budget=HINT_TIME_BUDGET, solve_cache_file=None):
+    hint_service = HintService(hint_processes, solve_cache_file=solve_cache_file) if hint_processes else None
+    solve_cache = SolveCache(file_name=solve_cache_file) if solve_cache_file and not hint_processes else None
+    game_server = GameServer(hint_workers, hint_service=hint_service, hint_time_budget=hint_time_budget, solve_cache=solve_cache)
+    server = await game_server.start(host, port)
+    print(f"Wordle server listening on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if hint_service is not None:
+            hint_service.close()
+        game_server.save_solve_cache()
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many concurrent Wordle games over a line-based TCP protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--hint-workers", type=int, default=4, help="threads used for solver hints")
+    parser.add_argument("--hint-processes", type=int, default=0, help="run solver hints on this many worker processes instead")
+    parser.add_argument("--hint-budget", type=float, default=HINT_TIME_BUDGET * 1000, help="longest a hint may take (ms)")
+    parser.add_argument("--solve-cache", default=None, help="file to load solver results from at startup and save them to on shutdown")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run_server(args.host, args.port, args.hint_workers, args.hint_processes, args.hint_budget / 1000, args.solve_cache))
+    except KeyboardInterrupt:
+        pass  # The solve cache has already been saved by run_server
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from wordle_bot import EntropyMaximisationAgent
+from word_feedback import get_feedback_code, ALL_GREEN_PATTERN_CODE
+from word_lexicon import get_allowed_words_lexicon, get_possible_answers_lexicon
+from hard_mode import get_hard_mode_violation
+import secrets
+
+MAX_WORD_LENGTH = 5
+MAX_ATTEMPTS = 6
+HINT_TIME_BUDGET = 2.0  # Longest a player waits for a generated guess (seconds)
+DEFAULT_NUM_BOARDS = 4  # Boards in a multi-board game, as in Quordle
+
+# Outcomes of submitting a guess to a game session
+GUESS_ACCEPTED = "accepted"
+GUESS_WRONG_LENGTH = "wrong_length"
+GUESS_NOT_ALLOWED = "not_allowed"
+GUESS_BREAKS_HARD_MODE = "hard_mode_violation"
+GAME_ALREADY_OVER = "game_over"
+
+# Function to choose a random target word for a new session
+def choose_session_target_word():
+    return secrets.choice(get_possible_answers_lexicon().words)
+
+# Function to choose distinct random target words for a new multi-board session
+def choose_session_target_words(num_boards):
+    return secrets.SystemRandom().sample(get_possible_answers_lexicon().words, num_boards)
+
+# Function to get the number of attempts allowed in a multi-board game (one more per extra board: 9 for four boards, as in Quordle)
+def get_multi_board_max_attempts(num_boards):
+    return MAX_ATTEMPTS + num_boards - 1
+
+# Class to hold the state of one Wordle game, independent of how it is displayed or where input comes from
+class GameSession:
+    def __init__(self, player_id=None, player_db=None, target_word=None, max_bot_guesses=3, entropy_bot=None, hard_mode=False):
+        self.player_id = player_id
+        self.player_db = player_db  # Stats are recorded when the game ends if a database and player are given
+        self.target_word = target_word or choose_session_target_word()
+        self.max_bot_guesses = max_bot_guesses
+        self.hard_mode = hard_mode  # Every guess must keep revealed greens in place and reuse revealed letters
+        self.entropy_bot = entropy_bot or EntropyMaximisationAgent(use_strategy_tree=True, hard_mode=hard_mode)
+        self.attempts = 0
+        self.bot_guesses_used = 0
+        self.guess_history = []  # (guess, pattern code) pairs, in order
+        self.candidate_mask = self.entropy_bot.get_initial_candidate_mask()  # Boolean mask over the allowed word list
+        self.finished = False
+        self.won = False
+
+    # Method to check whether the player has any generated guesses left
+    def can_use_hint(self):
+        return not self.finished and self.bot_guesses_used < self.max_bot_guesses
+
+    # Method to get the hard-mode rule a guess breaks, as a message (None if the guess is allowed or the game is not in hard mode)
+    def get_hard_mode_violation(self, guess):
+        if not self.hard_mode:
+            return None
+        return get_hard_mode_violation(guess.lower().strip(), self.guess_history)
+
+    # Method to get a hint that needs no search (strategy tree, opening guess or second-guess table), or None
+    def get_precomputed_hint(self):
+        hint = self.entropy_bot.get_tree_guess(self.guess_history)
+        if hint is None and self.attempts == 0:
+            hint = self.entropy_bot.get_opening_guess()
+        elif hint is None and self.attempts == 1:
+            first_guess, first_guess_pattern_code = self.guess_history[0]
+            hint = self.entropy_bot.get_second_guess(first_guess, first_guess_pattern_code)
+        return hint
+
+    # Method to use one of the player's generated guesses (None if none are left); may run an entropy search
+    # With a time budget (seconds) the search stops at the deadline with the best guess so far, reporting progress to the callback
+    def request_hint(self, time_budget=None, progress_callback=None):
+        if not self.can_use_hint():
+            return None
+        hint = self.get_precomputed_hint()
+        legal_guess_mask = self.entropy_bot.get_legal_guess_mask(self.guess_history) if hint is None and self.hard_mode else None
+        if hint is None and time_budget is None:
+            hint = self.entropy_bot.choose_guess_from_mask(self.candidate_mask, legal_guess_mask)
+        elif hint is None:
+            hint = self.entropy_bot.choose_guess_with_deadline(self.candidate_mask, time_budget, progress_callback, legal_guess_mask)
+        return self.use_hint(hint)
+
+    # Method to count a hint produced elsewhere (e.g. by a hint service) against the player's generated guesses
+    def use_hint(self, hint):
+        self.bot_guesses_used += 1
+        return hint
+
+    # Method to submit a guess, returning (outcome, pattern code); the pattern code is None unless the guess was accepted
+    def submit_guess(self, guess):
+        guess = guess.lower().strip()
+        if self.finished:
+            return GAME_ALREADY_OVER, None
+        if len(guess) != MAX_WORD_LENGTH:
+            return GUESS_WRONG_LENGTH, None
+        if guess not in get_allowed_words_lexicon():
+            return GUESS_NOT_ALLOWED, None
+        if self.get_hard_mode_violation(guess) is not None:
+            return GUESS_BREAKS_HARD_MODE, None
+
+        pattern_code = get_feedback_code(guess, self.target_word)
+        self.attempts += 1
+        self.guess_history.append((guess, pattern_code))
+        self.candidate_mask = self.entropy_bot.narrow_candidate_mask(self.candidate_mask, guess, pattern_code)
+
+        if pattern_code == ALL_GREEN_PATTERN_CODE:
+            self.finish(True)
+        elif self.attempts >= MAX_ATTEMPTS:
+            self.finish(False)
+        return GUESS_ACCEPTED, pattern_code
+
+    # Method to end the game and record the result
+    def finish(self, won):
+        self.finished = True
+        self.won = won
+        if self.player_db is not None and self.player_id is not None:
+            self.player_db.update_player_stats(self.player_id, won, self.attempts if won else MAX_ATTEMPTS, self.bot_guesses_used)
+
+# Class to hold the state of a multi-board game, where every guess is played on several target words at once
+# Multi-board games are not recorded in player stats, as leaderboard scores assume single-board games
+class MultiBoardSession:
+    def __init__(self, target_words=None, num_boards=DEFAULT_NUM_BOARDS, max_bot_guesses=3, entropy_bot=None):
+        self.target_words = list(target_words or choose_session_target_words(num_boards))
+        self.num_boards = len(self.target_words)
+        self.max_attempts = get_multi_board_max_attempts(self.num_boards)
+        self.max_bot_guesses = max_bot_guesses
+        self.entropy_bot = entropy_bot or EntropyMaximisationAgent()
+        self.attempts = 0
+        self.bot_guesses_used = 0
+        self.guess_history = []  # (guess, pattern codes) pairs, in order; a board's pattern code is None once it is solved
+        self.candidate_masks = [self.entropy_bot.get_initial_candidate_mask() for _ in range(self.num_boards)]
+        self.solved_attempts = [None] * self.num_boards  # Attempt on which each board was solved
+        self.finished = False
+        self.won = False
+
+    # Method to get the indices of the boards still to be solved
+    def get_unsolved_boards(self):
+        return [board for board in range(self.num_boards) if self.solved_attempts[board] is None]
+
+    # Method to check whether the player has any generated guesses left
+    def can_use_hint(self):
+        return not self.finished and self.bot_guesses_used < self.max_bot_guesses
+
+    # Method to get a hint that needs no search (the opening guess, or the last candidate of a board), or None
+    def get_precomputed_hint(self):
+        if self.attempts == 0:
+            return self.entropy_bot.get_opening_guess()  # Every board starts with the same candidates
+        return self.entropy_bot.get_multi_board_solved_guess([self.candidate_masks[board] for board in self.get_unsolved_boards()])
+
+    # Method to use one of the player's generated guesses (None if none are left), chosen jointly for every unsolved board
+    # With a time budget (seconds) the search stops at the deadline with the best guess so far, reporting progress to the callback
+    def request_hint(self, time_budget=None, progress_callback=None):
+        if not self.can_use_hint():
+            return None
+        hint = self.get_precomputed_hint()
+        candidate_masks = [self.candidate_masks[board] for board in self.get_unsolved_boards()]
+        if hint is None and time_budget is None:
+            hint = self.entropy_bot.choose_multi_board_guess(candidate_masks)
+        elif hint is None:
+            hint = self.entropy_bot.choose_multi_board_guess_with_deadline(candidate_masks, time_budget, progress_callback)
+        self.bot_guesses_used += 1
+        return hint
+
+    # Method to submit a guess to every unsolved board, returning (outcome, pattern codes); pattern codes is None unless the guess was accepted
+    def submit_guess(self, guess):
+        guess = guess.lower().strip()
+        if self.finished:
+            return GAME_ALREADY_OVER, None
+        if len(guess) != MAX_WORD_LENGTH:
+            return GUESS_WRONG_LENGTH, None
+        if guess not in get_allowed_words_lexicon():
+            return GUESS_NOT_ALLOWED, None
+
+        self.attempts += 1
+        pattern_codes = [None] * self.num_boards
+        for board in self.get_unsolved_boards():
+            pattern_codes[board] = get_feedback_code(guess, self.target_words[board])
+            self.candidate_masks[board] = self.entropy_bot.narrow_candidate_mask(self.candidate_masks[board], guess, pattern_codes[board])
+            if pattern_codes[board] == ALL_GREEN_PATTERN_CODE:
+                self.solved_attempts[board] = self.attempts
+        self.guess_history.append((guess, pattern_codes))
+
+        if not self.get_unsolved_boards():
+            self.finished, self.won = True, True
+        elif self.attempts >= self.max_attempts:
+            self.finished = True
+        return GUESS_ACCEPTED, pattern_codes
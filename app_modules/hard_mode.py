@@ -0,0 +1,137 @@
+from packed_words import ALPHABET_SIZE
+from word_feedback import WORD_LENGTH, decode_pattern_code
+import numpy as np
+import argparse
+import time
+
+MAX_LETTER_COUNT = WORD_LENGTH
+
+# Function to convert a letter into its index (0-25)
+def letter_index(letter):
+    return ord(letter) - ord("a")
+
+# Function to work out the hard-mode rules revealed by a game so far, as (green letters, minimum letter counts)
+# Hard mode only requires greens to stay in place and revealed letters (green or yellow) to be reused, as often as they were revealed
+def get_hard_mode_constraints(guess_history):
+    green_letters = {}
+    min_counts = {}
+    for guess, pattern_code in guess_history:
+        revealed_counts = {}
+        for position, (letter, tile) in enumerate(zip(guess, decode_pattern_code(pattern_code))):
+            if tile == "G":
+                green_letters[position] = letter
+            if tile in "GY":
+                revealed_counts[letter] = revealed_counts.get(letter, 0) + 1
+        for letter, count in revealed_counts.items():
+            min_counts[letter] = max(min_counts.get(letter, 0), count)
+    return green_letters, min_counts
+
+# Function to work out every constraint feedback puts on the answer, as (green letters, excluded letters, minimum counts, maximum counts)
+def get_feedback_constraints(guess_history):
+    green_letters, min_counts = get_hard_mode_constraints(guess_history)
+    excluded_letters = {}
+    max_counts = {}
+    for guess, pattern_code in guess_history:
+        revealed_counts = {}
+        for position, (letter, tile) in enumerate(zip(guess, decode_pattern_code(pattern_code))):
+            if tile != "G":
+                excluded_letters.setdefault(position, set()).add(letter)
+            if tile in "GY":
+                revealed_counts[letter] = revealed_counts.get(letter, 0) + 1
+        # A grey tile means the letter appears exactly as often as it was revealed in that guess
+        for letter, tile in zip(guess, decode_pattern_code(pattern_code)):
+            if tile == "B":
+                max_counts[letter] = revealed_counts.get(letter, 0)
+    return green_letters, excluded_letters, min_counts, max_counts
+
+# Class to find words matching letter constraints by intersecting prebuilt bitsets (one bit per word, packed into bytes)
+# position_bitsets[position, letter]: words with that letter in that position
+# count_bitsets[letter, count]: words containing the letter at least count times
+class PositionalWordIndex:
+    def __init__(self, packed_word_list):
+        self.num_words = len(packed_word_list)
+        letter_array = packed_word_list.get_letter_array()
+        letter_counts = packed_word_list.letter_counts
+
+        num_bytes = (self.num_words + 7) // 8
+        self.all_words_bitset = np.packbits(np.ones(self.num_words, dtype=bool))
+        self.position_bitsets = np.empty((WORD_LENGTH, ALPHABET_SIZE, num_bytes), dtype=np.uint8)
+        for position in range(WORD_LENGTH):
+            for letter in range(ALPHABET_SIZE):
+                self.position_bitsets[position, letter] = np.packbits(letter_array[:, position] == letter)
+        self.count_bitsets = np.empty((ALPHABET_SIZE, MAX_LETTER_COUNT + 2, num_bytes), dtype=np.uint8)
+        for letter in range(ALPHABET_SIZE):
+            for count in range(MAX_LETTER_COUNT + 2):
+                self.count_bitsets[letter, count] = np.packbits(letter_counts[:, letter] >= count)
+
+    # Method to get the bitset of words matching constraints
+    # green_letters: position -> letter, excluded_letters: position -> set of letters,
+    # min_counts / max_counts: letter -> number of times the letter must / may appear
+    def get_constraint_bitset(self, green_letters=None, excluded_letters=None, min_counts=None, max_counts=None):
+        bitset = self.all_words_bitset.copy()
+        for position, letter in (green_letters or {}).items():
+            bitset &= self.position_bitsets[position, letter_index(letter)]
+        for position, letters in (excluded_letters or {}).items():
+            for letter in letters:
+                bitset &= ~self.position_bitsets[position, letter_index(letter)]
+        for letter, min_count in (min_counts or {}).items():
+            bitset &= self.count_bitsets[letter_index(letter), min(min_count, MAX_LETTER_COUNT + 1)]
+        for letter, max_count in (max_counts or {}).items():
+            bitset &= ~self.count_bitsets[letter_index(letter), min(max_count + 1, MAX_LETTER_COUNT + 1)]
+        return bitset
+
+    # Method to convert a bitset into a boolean mask over the word list
+    def get_mask(self, bitset):
+        return np.unpackbits(bitset, count=self.num_words).view(bool)
+
+    # Method to get the mask of guesses allowed in hard mode after some (guess, pattern code) history
+    def get_hard_mode_mask(self, guess_history):
+        green_letters, min_counts = get_hard_mode_constraints(guess_history)
+        return self.get_mask(self.get_constraint_bitset(green_letters, min_counts=min_counts))
+
+    # Method to get the mask of words consistent with all the feedback in some (guess, pattern code) history
+    def get_candidate_mask(self, guess_history):
+        return self.get_mask(self.get_constraint_bitset(*get_feedback_constraints(guess_history)))
+
+# Function to check a guess is allowed in hard mode, returning the broken rule as a message (None if the guess is allowed)
+def get_hard_mode_violation(guess, guess_history):
+    green_letters, min_counts = get_hard_mode_constraints(guess_history)
+    for position, letter in sorted(green_letters.items()):
+        if guess[position] != letter:
+            return f"Letter {position + 1} must be {letter.upper()}"
+    for letter, min_count in sorted(min_counts.items()):
+        if guess.count(letter) < min_count:
+            return f"Guess must contain {letter.upper()}" + (f" {min_count} times" if min_count > 1 else "")
+    return None
+
+# Function to time hard-mode queries on the full allowed word list from the command line
+def main():
+    from word_lexicon import get_allowed_words_lexicon, get_possible_answers_lexicon
+    from word_feedback import get_feedback_code
+
+    parser = argparse.ArgumentParser(description="Time hard-mode legality and candidate queries on the allowed word list.")
+    parser.add_argument("--games", type=int, default=200, help="number of answers to replay a fixed guess sequence against")
+    args = parser.parse_args()
+
+    allowed_words_lexicon = get_allowed_words_lexicon()
+    start_time = time.perf_counter()
+    word_index = PositionalWordIndex(allowed_words_lexicon.get_packed_words())
+    print(f"Index built in {(time.perf_counter() - start_time) * 1000:.1f}ms for {word_index.num_words} words")
+
+    legal_times, candidate_times, check_times = [], [], []
+    for target_word in get_possible_answers_lexicon().words[:args.games]:
+        guess_history = [(guess, get_feedback_code(guess, target_word)) for guess in ["tares", "colin", "dumpy"]]
+        start_time = time.perf_counter()
+        word_index.get_hard_mode_mask(guess_history)
+        legal_times.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        word_index.get_candidate_mask(guess_history)
+        candidate_times.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        get_hard_mode_violation(target_word, guess_history)
+        check_times.append(time.perf_counter() - start_time)
+    for label, times in [("Legal-guess query", legal_times), ("Candidate query", candidate_times), ("Single-guess check", check_times)]:
+        print(f"{label}: p50 {np.median(times) * 1e6:.0f}us | max {max(times) * 1e6:.0f}us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+from wordle_bot import EntropyMaximisationAgent, get_pattern_matrix
+from solve_cache import SolveCache
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import multiprocessing.util
+import numpy as np
+import argparse
+import asyncio
+import time
+import os
+
+# Worker-process state (each worker maps the same pattern matrix file read-only; pages are shared through the OS page cache)
+worker_agent = None
+
+# Function to set up a hint worker process
+# With a solve cache file, each worker starts from the saved cache and adds its own results to the file when it exits
+def initialise_hint_worker(lookahead_time_budget, solve_cache_size, solve_cache_file=None):
+    global worker_agent
+    solve_cache = SolveCache(solve_cache_size, solve_cache_file) if solve_cache_size > 0 else None
+    worker_agent = EntropyMaximisationAgent(lookahead_time_budget=lookahead_time_budget, solve_cache=solve_cache)
+    worker_agent.get_pattern_matrix()
+    if solve_cache_file is not None:
+        multiprocessing.util.Finalize(worker_agent, worker_agent.save_solve_cache, exitpriority=10)
+
+# Function to pack a boolean candidate mask into a bitmask (one bit per candidate word, ~1.6KB per request)
+def pack_candidate_mask(candidate_mask):
+    return np.packbits(candidate_mask).tobytes()
+
+# Function to unpack a bitmask back into a boolean candidate mask
+def unpack_candidate_mask(candidate_bits, num_words):
+    return np.unpackbits(np.frombuffer(candidate_bits, dtype=np.uint8), count=num_words).astype(bool)
+
+# Function run in a worker process to choose the best guess for a packed candidate set, returning (guess, compute seconds)
+# With a time budget (seconds) the search returns the best guess found by the deadline
+def choose_hint(candidate_bits, time_budget=None):
+    start_time = time.perf_counter()
+    candidate_mask = unpack_candidate_mask(candidate_bits, len(worker_agent.get_pattern_matrix().target_words))
+    if time_budget is None:
+        guess = worker_agent.choose_guess_from_mask(candidate_mask)
+    else:
+        guess = worker_agent.choose_guess_with_deadline(candidate_mask, time_budget)
+    return guess, time.perf_counter() - start_time
+
+# Class to run entropy hint searches on a pool of worker processes, with queue-depth, latency and in-flight metrics
+class HintService:
+    def __init__(self, processes=None, lookahead_time_budget=None, solve_cache_size=4096, latency_window=1000, solve_cache_file=None):
+        self.processes = processes or os.cpu_count()
+        get_pattern_matrix()  # Build the matrix file once here, so workers only ever map it
+        self.executor = ProcessPoolExecutor(
+            self.processes, initializer=initialise_hint_worker, initargs=(lookahead_time_budget, solve_cache_size, solve_cache_file)
+        )
+        self.in_flight = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.max_in_flight = 0
+        self.latencies = deque(maxlen=latency_window)  # (total seconds, compute seconds) of recent requests
+
+    # Method to submit a hint request for a candidate mask, returning a concurrent.futures future of the guess
+    def submit(self, candidate_mask, time_budget=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start_time = time.perf_counter()
+        return self.executor.submit(choose_hint, pack_candidate_mask(candidate_mask), time_budget), start_time
+
+    # Method to record a finished request and get its guess
+    def complete(self, result, start_time):
+        self.in_flight -= 1
+        self.completed += 1
+        guess, compute_time = result
+        self.latencies.append((time.perf_counter() - start_time, compute_time))
+        return guess
+
+    # Method to choose the best guess for a candidate mask (blocking)
+    def choose_guess_from_mask(self, candidate_mask, time_budget=None):
+        future, start_time = self.submit(candidate_mask, time_budget)
+        try:
+            result = future.result()
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        return self.complete(result, start_time)
+
+    # Method to choose the best guess for a candidate mask without blocking the event loop
+    # Raises asyncio.TimeoutError if the result takes longer than timeout seconds (including time spent queued)
+    async def choose_guess_from_mask_async(self, candidate_mask, time_budget=None, timeout=None):
+        future, start_time = self.submit(candidate_mask, time_budget)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.in_flight -= 1
+            self.timed_out += 1
+            raise
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        return self.complete(result, start_time)
+
+    # Method to get the current service metrics
+    def get_metrics(self):
+        metrics = {
+            "processes": self.processes,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.processes),  # Requests waiting for a free worker
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "timed_out": self.timed_out,
+        }
+        if self.latencies:
+            total_times = np.array([latency[0] for latency in self.latencies]) * 1000
+            compute_times = np.array([latency[1] for latency in self.latencies]) * 1000
+            metrics["latency_ms_p50"] = float(np.percentile(total_times, 50))
+            metrics["latency_ms_p95"] = float(np.percentile(total_times, 95))
+            metrics["compute_ms_p50"] = float(np.percentile(compute_times, 50))
+            metrics["queue_wait_ms_p50"] = float(np.percentile(total_times - compute_times, 50))
+        return metrics
+
+    def close(self):
+        self.executor.shutdown()
+
+# Function to load test the hint service with concurrent requests for random candidate sets
+async def run_load_test(hint_service, num_requests, candidate_set_size):
+    num_words = len(get_pattern_matrix().target_words)
+    random_generator = np.random.default_rng(0)
+    candidate_masks = []
+    for _ in range(num_requests):
+        candidate_mask = np.zeros(num_words, dtype=bool)
+        candidate_mask[random_generator.choice(num_words, candidate_set_size, replace=False)] = True
+        candidate_masks.append(candidate_mask)
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[hint_service.choose_guess_from_mask_async(candidate_mask) for candidate_mask in candidate_masks])
+    return num_requests / (time.perf_counter() - start_time)
+
+# Function to run the hint service load test from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Load test the process-pool hint service.")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--candidates", type=int, default=200, help="candidate words per request")
+    args = parser.parse_args()
+
+    hint_service = HintService(args.processes, solve_cache_size=0)
+    try:
+        hints_per_second = asyncio.run(run_load_test(hint_service, args.requests, args.candidates))
+        print(f"Hints per second: {hints_per_second:.1f}")
+        for name, value in hint_service.get_metrics().items():
+            print(f"{name}: {value:.1f}" if isinstance(value, float) else f"{name}: {value}")
+    finally:
+        hint_service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from pattern_matrix import count_patterns
+from word_feedback import NUM_PATTERNS
+import numpy as np
+import argparse
+import time
+
+# Function to calculate c * log2(c) for an array of pattern counts (0 for empty patterns)
+def calculate_count_information(pattern_counts):
+    pattern_counts = np.asarray(pattern_counts, dtype=np.float64)
+    return pattern_counts * np.log2(np.maximum(pattern_counts, 1))
+
+# Class to keep every guess's feedback-pattern histogram over a shrinking candidate set
+# Entropy is read from a running sum(c * log2(c)) per guess: H = log2(n) - sum(c * log2(c)) / n
+class IncrementalEntropyEngine:
+    def __init__(self, pattern_matrix, candidate_mask, guess_indices=None, max_block_entries=1 << 22):
+        self.pattern_matrix = pattern_matrix
+        self.guess_indices = np.arange(len(pattern_matrix.guess_words)) if guess_indices is None else np.asarray(guess_indices)
+        self.max_block_entries = max_block_entries
+        self.candidate_mask = None
+        self.pattern_counts = None  # (guesses x 243) counts over the current candidates
+        self.count_information = None  # sum(c * log2(c)) of each guess's counts
+        self.rebuild(candidate_mask)
+
+    # Method to get the number of remaining candidates
+    def get_num_candidates(self):
+        return int(np.count_nonzero(self.candidate_mask))
+
+    # Method to get the guess rows of the pattern matrix for some candidate columns, in blocks that bound memory use
+    def iterate_pattern_blocks(self, candidate_indices):
+        block_size = max(1, self.max_block_entries // max(1, len(candidate_indices)))
+        tracks_every_guess = len(self.guess_indices) == len(self.pattern_matrix.guess_words)
+        for start in range(0, len(self.guess_indices), block_size):
+            end = min(start + block_size, len(self.guess_indices))
+            guess_rows = slice(start, end) if tracks_every_guess else self.guess_indices[start:end]
+            yield start, end, self.pattern_matrix.matrix[guess_rows][:, candidate_indices]
+
+    # Method to recount every histogram from scratch over a candidate mask
+    def rebuild(self, candidate_mask):
+        self.candidate_mask = np.array(candidate_mask, dtype=bool)
+        candidate_indices = np.flatnonzero(self.candidate_mask)
+        num_candidates = len(candidate_indices)
+        self.pattern_counts = np.zeros((len(self.guess_indices), NUM_PATTERNS), dtype=np.intp)
+        self.count_information = np.zeros(len(self.guess_indices))
+        count_information_table = calculate_count_information(np.arange(num_candidates + 1))  # Counts never exceed n
+        for start, end, pattern_block in self.iterate_pattern_blocks(candidate_indices):
+            pattern_counts = count_patterns(pattern_block)
+            self.pattern_counts[start:end] = pattern_counts
+            if num_candidates < NUM_PATTERNS:
+                # Fewer candidates than patterns: sum(c * log2(c)) is the sum of log2(own pattern count) over the candidates
+                own_pattern_counts = np.take_along_axis(pattern_counts, pattern_block.astype(np.intp), axis=1)
+                self.count_information[start:end] = np.log2(own_pattern_counts).sum(axis=1)
+            else:
+                self.count_information[start:end] = count_information_table[pattern_counts].sum(axis=1)
+
+    # Method to narrow the candidate set to a subset of the current one, subtracting only the eliminated words' patterns
+    def update(self, candidate_mask):
+        candidate_mask = np.asarray(candidate_mask, dtype=bool)
+        eliminated_indices = np.flatnonzero(self.candidate_mask & ~candidate_mask)
+        if len(eliminated_indices) == 0:
+            self.candidate_mask = candidate_mask.copy()
+            return
+
+        # Recounting the survivors is cheaper when more words were eliminated than kept
+        if len(eliminated_indices) >= np.count_nonzero(candidate_mask):
+            self.rebuild(candidate_mask)
+            return
+
+        flat_counts = self.pattern_counts.reshape(-1)
+        for start, end, pattern_block in self.iterate_pattern_blocks(eliminated_indices):
+            # Only the (guess, pattern) bins the eliminated words fall into change
+            offset_block = pattern_block.astype(np.intp)
+            offset_block += np.arange(end - start, dtype=np.intp)[:, None] * NUM_PATTERNS
+            removed_counts = np.bincount(offset_block.ravel(), minlength=(end - start) * NUM_PATTERNS)
+            changed_bins = np.flatnonzero(removed_counts)
+            old_counts = flat_counts[start * NUM_PATTERNS + changed_bins]
+            new_counts = old_counts - removed_counts[changed_bins]
+            flat_counts[start * NUM_PATTERNS + changed_bins] = new_counts
+
+            information_change = calculate_count_information(old_counts) - calculate_count_information(new_counts)
+            self.count_information[start:end] -= np.bincount(changed_bins // NUM_PATTERNS, weights=information_change, minlength=end - start)
+        self.candidate_mask = candidate_mask.copy()
+
+    # Method to get the expected information (entropy in bits) of every tracked guess over the current candidates
+    def get_expected_information(self):
+        num_candidates = self.get_num_candidates()
+        if num_candidates == 0:
+            return np.zeros(len(self.guess_indices))
+        return np.log2(num_candidates) - self.count_information / num_candidates
+
+# Function to compare incremental updates against full recomputation over solver-played games
+def run_incremental_benchmark(num_games, use_answer_pool):
+    from wordle_bot import EntropyMaximisationAgent
+    from word_lexicon import get_possible_answers_lexicon
+
+    agent = EntropyMaximisationAgent(use_answer_pool=use_answer_pool)
+    pattern_matrix = agent.get_pattern_matrix()
+    target_words = get_possible_answers_lexicon().words[:num_games]
+    incremental_time = full_time = 0.0
+    max_difference = 0.0
+    for target_word in target_words:
+        candidate_mask = agent.get_initial_candidate_mask()
+        guess = agent.get_opening_guess()
+        candidate_mask = agent.narrow_candidate_mask(candidate_mask, guess, pattern_matrix.get_pattern_code(guess, target_word))
+        engine = IncrementalEntropyEngine(pattern_matrix, candidate_mask)
+        while guess != target_word and np.count_nonzero(candidate_mask) > 1:
+            guess = pattern_matrix.guess_words[int(np.argmax(engine.get_expected_information()))]
+            candidate_mask = agent.narrow_candidate_mask(candidate_mask, guess, pattern_matrix.get_pattern_code(guess, target_word))
+
+            start_time = time.perf_counter()
+            engine.update(candidate_mask)
+            expected_information = engine.get_expected_information()
+            incremental_time += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            full_expected_information = pattern_matrix.calculate_expected_information_batch(np.flatnonzero(candidate_mask))
+            full_time += time.perf_counter() - start_time
+            max_difference = max(max_difference, float(np.max(np.abs(expected_information - full_expected_information))))
+    return incremental_time, full_time, max_difference
+
+# Function to run the incremental entropy benchmark from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Compare incremental histogram updates against recomputing every guess's entropy.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--answer-pool", action="store_true", help="use the answer-pool solver mode")
+    args = parser.parse_args()
+
+    incremental_time, full_time, max_difference = run_incremental_benchmark(args.games, args.answer_pool)
+    print(f"Later-hint entropy time over {args.games} games: incremental {incremental_time:.2f}s | full recompute {full_time:.2f}s")
+    print(f"Largest entropy difference: {max_difference:.2e} bits")
+
+if __name__ == "__main__":
+    main()
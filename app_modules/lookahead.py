@@ -0,0 +1,109 @@
+from pattern_matrix import get_top_k_indices, get_candidate_set_fingerprint
+from word_feedback import ALL_GREEN_PATTERN_CODE
+import numpy as np
+import math
+import time
+
+# Function to estimate how many more guesses a set of n candidates needs (used below the second ply)
+def estimate_remaining_guesses(num_candidates):
+    if num_candidates <= 1:
+        return num_candidates
+    if num_candidates == 2:
+        return 1.5
+    # Roughly 2.5 useful bits of information per later guess, but never below the best case (one word solved next guess, the rest the guess after)
+    return max(2 - 1 / num_candidates, 1 + math.log2(num_candidates) / 2.5)
+
+# Function to split a candidate set into groups by the feedback pattern a guess would give
+def partition_candidates(pattern_matrix, guess_index, candidate_indices):
+    pattern_codes = pattern_matrix.matrix[guess_index, candidate_indices]
+    order = np.argsort(pattern_codes, kind="stable")
+    sorted_codes = pattern_codes[order]
+    split_points = np.flatnonzero(np.diff(sorted_codes)) + 1
+    return zip(sorted_codes[np.r_[0, split_points]], np.split(candidate_indices[order], split_points))
+
+# Exception raised inside a two-ply evaluation when the hint's time budget runs out
+class LookaheadTimeout(Exception):
+    pass
+
+# Class to score guesses by the expected number of guesses still needed over the next two plies
+class LookaheadScorer:
+    def __init__(self, pattern_matrix, top_n=10, second_ply_top_n=5, time_budget=0.05, max_cache_size=100000):
+        self.pattern_matrix = pattern_matrix
+        self.top_n = top_n
+        self.second_ply_top_n = second_ply_top_n
+        self.time_budget = time_budget  # Seconds allowed per hint
+        self.max_cache_size = max_cache_size
+        self.cost_cache = {}  # Candidate-set fingerprint -> expected guesses to finish (second ply)
+        self.deadline = math.inf  # perf_counter() time the current hint must finish by
+
+    # Method to get the best few guesses (by entropy) from the candidate set itself
+    def get_entropy_shortlist(self, candidate_indices, k):
+        expected_information = self.pattern_matrix.calculate_expected_information_batch(candidate_indices, candidate_indices)
+        return candidate_indices[get_top_k_indices(expected_information, k)]
+
+    # Method to calculate a lower bound on a guess's expected cost (every unsolved word needs at least one more guess, most need two)
+    def calculate_cost_lower_bound(self, guess_index, candidate_indices):
+        lower_bound = 0
+        for pattern_code, group in partition_candidates(self.pattern_matrix, guess_index, candidate_indices):
+            if pattern_code != ALL_GREEN_PATTERN_CODE:
+                lower_bound += 2 * len(group) - 1
+        return 1 + lower_bound / len(candidate_indices)
+
+    # Method to calculate a guess's expected cost, using the heuristic estimate for each group it leaves
+    def calculate_one_ply_cost(self, guess_index, candidate_indices):
+        total_cost = 0
+        for pattern_code, group in partition_candidates(self.pattern_matrix, guess_index, candidate_indices):
+            if pattern_code != ALL_GREEN_PATTERN_CODE:
+                total_cost += len(group) * estimate_remaining_guesses(len(group))
+        return 1 + total_cost / len(candidate_indices)
+
+    # Method to calculate the expected guesses to finish a candidate set, choosing the best second-ply guess (memoised)
+    def calculate_set_cost(self, candidate_indices):
+        if len(candidate_indices) <= 2:
+            return estimate_remaining_guesses(len(candidate_indices))
+
+        fingerprint = get_candidate_set_fingerprint(candidate_indices)
+        if fingerprint in self.cost_cache:
+            return self.cost_cache[fingerprint]
+
+        shortlist = self.get_entropy_shortlist(candidate_indices, self.second_ply_top_n)
+        set_cost = min(self.calculate_one_ply_cost(guess_index, candidate_indices) for guess_index in shortlist)
+
+        if len(self.cost_cache) >= self.max_cache_size:
+            self.cost_cache.clear()
+        self.cost_cache[fingerprint] = set_cost
+        return set_cost
+
+    # Method to calculate a guess's expected cost over two plies (None if the bound shows it cannot beat best_cost)
+    def calculate_two_ply_cost(self, guess_index, candidate_indices, best_cost=math.inf):
+        if self.calculate_cost_lower_bound(guess_index, candidate_indices) >= best_cost:
+            return None
+
+        total_cost = 0
+        for pattern_code, group in partition_candidates(self.pattern_matrix, guess_index, candidate_indices):
+            if time.perf_counter() > self.deadline:
+                raise LookaheadTimeout()  # Checked per group, as one guess over a large candidate set can take longer than the budget
+            if pattern_code != ALL_GREEN_PATTERN_CODE:
+                total_cost += len(group) * self.calculate_set_cost(group)
+        return 1 + total_cost / len(candidate_indices)
+
+    # Method to choose the guess with the lowest expected remaining guesses, within the time budget
+    # shortlist is the candidates' guesses in entropy order, if the caller has already scored them
+    def choose_best_guess(self, candidate_indices, shortlist=None):
+        self.deadline = time.perf_counter() + self.time_budget
+        if shortlist is None:
+            shortlist = self.get_entropy_shortlist(candidate_indices, self.top_n)
+        best_guess_index = int(shortlist[0])  # Greedy choice, kept if the budget runs out before a two-ply cost is finished
+        if len(candidate_indices) <= 2:
+            return best_guess_index
+
+        best_cost = math.inf
+        for guess_index in shortlist[:self.top_n]:
+            try:
+                cost = self.calculate_two_ply_cost(guess_index, candidate_indices, best_cost)
+            except LookaheadTimeout:
+                break
+            if cost is not None and cost < best_cost:
+                best_cost = cost
+                best_guess_index = int(guess_index)
+        return best_guess_index
@@ -1,7 +1,13 @@
 from colorama import Fore, Style
 import game_logic
 from database_system import PlayerDatabase, DatabaseConnection
-import msvcrt
+import getpass
+
+# Masked password input needs msvcrt, which only exists on Windows; other platforms fall back to getpass (no echo)
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 DIVIDER = "=" * 115 + "\n"  # Divides terminal when a new menu is displayed
 
@@ -44,9 +50,11 @@ def display_main_menu():
     print(change_text_style("MAIN MENU\n", "BOLD"))
     main_menu_options = change_text_colour(
         "   1. Start new game\n\n"
-        "   2. View leaderboard\n\n"
-        "   3. Log out\n\n"
-        "   4. Delete account\n",  
+        "   2. Start new game (hard mode)\n\n"
+        "   3. Start new 4-board game\n\n"
+        "   4. View leaderboard\n\n"
+        "   5. Log out\n\n"
+        "   6. Delete account\n",  
         "CYAN"
         )
     print(main_menu_options)
@@ -78,6 +86,8 @@ def get_menu_option_choice(prompt, first_option, last_option):
 
 # Function to mask login password with asterisks
 def mask_password_input(prompt):
+    if msvcrt is None:
+        return getpass.getpass(prompt)
     print(prompt, end="", flush=True)
     password = ""
     while True:
@@ -198,13 +208,13 @@ def handle_main_menu(player_db, player_id):
     while True:
         display_main_menu()
         main_menu_option_choice = None
-        while main_menu_option_choice not in [1, 2, 3, 4]:
+        while main_menu_option_choice not in [1, 2, 3, 4, 5, 6]:
             try:
-                main_menu_option_choice = get_menu_option_choice("Please enter a menu choice (1-4): ", 1, 4)
+                main_menu_option_choice = get_menu_option_choice("Please enter a menu choice (1-6): ", 1, 6)
 
                 # Invalid menu option choice inputted
-                if main_menu_option_choice not in [1, 2, 3, 4]:
-                    raise ValueError("Invalid choice. Please enter a number between 1 and 4.")
+                if main_menu_option_choice not in [1, 2, 3, 4, 5, 6]:
+                    raise ValueError("Invalid choice. Please enter a number between 1 and 6.")
                 
             except ValueError as e:
                 print(e)
@@ -214,18 +224,28 @@ def handle_main_menu(player_db, player_id):
         if main_menu_option_choice == 1:
             print(DIVIDER)
             game_logic.play_game(player_id, player_db)
+
+        # Play new game in hard mode
+        elif main_menu_option_choice == 2:
+            print(DIVIDER)
+            game_logic.play_game(player_id, player_db, hard_mode=True)
+
+        # Play new multi-board game (not recorded on the leaderboard)
+        elif main_menu_option_choice == 3:
+            print(DIVIDER)
+            game_logic.play_multi_board_game()
     
         # View leaderboard
-        elif main_menu_option_choice == 2:
-            display_leaderboard(player_db.get_leaderboard_message())
+        elif main_menu_option_choice == 4:
+            display_leaderboard(player_db.get_leaderboard_message(player_id=player_id))
 
         # Log out
-        elif main_menu_option_choice == 3:
+        elif main_menu_option_choice == 5:
             print(change_text_colour("Logging out...\n", "YELLOW"))
             return True  # Go to start menu
     
         # Delete account
-        elif main_menu_option_choice == 4:
+        elif main_menu_option_choice == 6:
             while True:
                 try:
                     response = input(change_text_colour("Are you sure you want to delete your account? (y/n): ", "RED")).strip().lower()
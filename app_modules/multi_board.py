@@ -0,0 +1,117 @@
+from word_feedback import NUM_PATTERNS
+import numpy as np
+import argparse
+import random
+import time
+
+# Function to calculate the entropy of every guess on every board in one pass, as a (guesses x boards) array
+# Every board's candidate columns are gathered together, so each guess row of the pattern matrix is read once for all boards,
+# and each board's patterns are offset into their own 243 bins so one bincount gives every (guess, board) histogram
+# Every board must have at least one candidate (solved boards should be left out)
+def calculate_multi_board_entropies(pattern_matrix, board_candidate_indices, guess_indices=None, max_block_entries=1 << 17):
+    if guess_indices is None:
+        guess_indices = np.arange(len(pattern_matrix.guess_words))
+    entropies = np.empty((len(guess_indices), len(board_candidate_indices)))
+    for start, end, block_entropies in generate_multi_board_entropy_blocks(pattern_matrix, board_candidate_indices, guess_indices, max_block_entries):
+        entropies[start:end] = block_entropies
+    return entropies
+
+# Function to calculate the entropies of calculate_multi_board_entropies block by block, yielding (start, end, entropies of guesses start:end)
+def generate_multi_board_entropy_blocks(pattern_matrix, board_candidate_indices, guess_indices, max_block_entries=1 << 17):
+    num_boards = len(board_candidate_indices)
+    board_sizes = np.array([len(candidate_indices) for candidate_indices in board_candidate_indices])
+    candidate_indices = np.concatenate(board_candidate_indices).astype(np.intp)
+    column_offsets = np.repeat(np.arange(num_boards, dtype=np.intp) * NUM_PATTERNS, board_sizes)
+    board_starts = np.concatenate([[0], np.cumsum(board_sizes)[:-1]])
+    bins_per_row = num_boards * NUM_PATTERNS
+
+    # Counts never exceed the largest board, so c * log2(c) and log2(c) are table lookups
+    counts = np.arange(board_sizes.max() + 1)
+    log_counts = np.zeros(len(counts))
+    log_counts[1:] = np.log2(counts[1:])
+    count_information_table = counts * log_counts
+
+    block_size = max(1, max_block_entries // max(len(candidate_indices), bins_per_row))  # Also bounds the histogram, keeping it in cache
+    for start in range(0, len(guess_indices), block_size):
+        end = min(start + block_size, len(guess_indices))
+        offset_block = pattern_matrix.matrix[guess_indices[start:end]][:, candidate_indices].astype(np.intp)
+        offset_block += column_offsets
+        offset_block += np.arange(end - start, dtype=np.intp)[:, None] * bins_per_row
+        pattern_counts = np.bincount(offset_block.ravel(), minlength=(end - start) * bins_per_row)
+        if len(candidate_indices) < bins_per_row:
+            # Fewer candidates than bins: sum(c * log2(c)) per board is the sum of log2(own pattern count) over its candidates
+            count_information = np.add.reduceat(log_counts[pattern_counts[offset_block]], board_starts, axis=1)
+        else:
+            count_information = count_information_table[pattern_counts.reshape(end - start, num_boards, NUM_PATTERNS)].sum(axis=2)
+        yield start, end, np.log2(board_sizes) - count_information / board_sizes
+
+# Function to score guesses on several boards block by block until a deadline, yielding (best guess index, best score, guesses scored, total guesses)
+# As with generate_anytime_hints, the first yield comes before any scoring and guess_indices should be in the order to try them
+# A guess scores its entropy summed over every board, plus its entry in win_bonus (an array over every guess word) if given
+def generate_anytime_multi_board_hints(pattern_matrix, board_candidate_indices, guess_indices, deadline, win_bonus=None, max_block_entries=1 << 17):
+    best_index, best_score = int(guess_indices[0]), None
+    yield best_index, best_score, 0, len(guess_indices)
+
+    # The joint kernel's blocks are small, so the time between deadline checks stays at a few milliseconds
+    if time.monotonic() >= deadline:
+        return
+    for start, end, block_entropies in generate_multi_board_entropy_blocks(pattern_matrix, board_candidate_indices, guess_indices, max_block_entries):
+        block_guess_indices = guess_indices[start:end]
+        scores = block_entropies.sum(axis=1)
+        if win_bonus is not None:
+            scores += win_bonus[block_guess_indices]
+
+        block_best = int(np.argmax(scores))  # First maximum, so ties keep the more promising guess
+        if best_score is None or scores[block_best] > best_score:
+            best_index, best_score = int(block_guess_indices[block_best]), float(scores[block_best])
+        yield best_index, best_score, end, len(guess_indices)
+        if time.monotonic() >= deadline:
+            return
+
+# Function to play multi-board games with the joint solver, timing its scoring against scoring each board separately
+def run_multi_board_benchmark(num_games, num_boards, use_answer_pool, seed=0):
+    from game_session import MultiBoardSession
+    from wordle_bot import EntropyMaximisationAgent
+    from word_lexicon import get_possible_answers_lexicon
+
+    agent = EntropyMaximisationAgent(use_answer_pool=use_answer_pool)
+    pattern_matrix = agent.get_pattern_matrix()
+    random_generator = random.Random(seed)
+    wins, total_attempts = 0, 0
+    joint_time = separate_time = 0.0
+    max_difference = 0.0
+    for _ in range(num_games):
+        target_words = random_generator.sample(get_possible_answers_lexicon().words, num_boards)
+        session = MultiBoardSession(target_words, max_bot_guesses=float("inf"), entropy_bot=agent)
+        while not session.finished:
+            board_candidate_indices = [np.flatnonzero(session.candidate_masks[board]) for board in session.get_unsolved_boards()]
+            if session.attempts > 0 and min(len(candidate_indices) for candidate_indices in board_candidate_indices) > 1:
+                guess_indices = None if use_answer_pool else np.unique(np.concatenate(board_candidate_indices))
+                start_time = time.perf_counter()
+                entropies = calculate_multi_board_entropies(pattern_matrix, board_candidate_indices, guess_indices)
+                joint_time += time.perf_counter() - start_time
+
+                start_time = time.perf_counter()
+                separate_entropies = [pattern_matrix.calculate_expected_information_batch(candidate_indices, guess_indices) for candidate_indices in board_candidate_indices]
+                separate_time += time.perf_counter() - start_time
+                max_difference = max(max_difference, float(np.max(np.abs(entropies - np.stack(separate_entropies, axis=1)))))
+            session.submit_guess(session.request_hint())
+        wins += session.won
+        total_attempts += session.attempts
+    return wins, total_attempts, joint_time, separate_time, max_difference
+
+# Function to run the multi-board benchmark from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Play multi-board games with the joint solver and compare joint against per-board scoring.")
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--boards", type=int, default=4)
+    parser.add_argument("--answer-pool", action="store_true", help="use the answer-pool solver mode")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    wins, total_attempts, joint_time, separate_time, max_difference = run_multi_board_benchmark(args.games, args.boards, args.answer_pool, args.seed)
+    print(f"{args.boards} boards: won {wins}/{args.games} games | average attempts {total_attempts / args.games:.3f}")
+    print(f"Scoring time: joint {joint_time:.2f}s | per board {separate_time:.2f}s | largest entropy difference {max_difference:.2e} bits")
+
+if __name__ == "__main__":
+    main()
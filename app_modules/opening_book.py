@@ -0,0 +1,86 @@
+from word_feedback import NUM_PATTERNS
+from word_lexicon import DATA_DIRECTORY, get_allowed_words_lexicon
+import argparse
+import os
+
+OPENING_ENTROPY_FILE_NAME = os.path.join(DATA_DIRECTORY, "word_entropy_information.txt")
+SECOND_GUESS_TABLE_FILE_NAME = os.path.join(DATA_DIRECTORY, "second_guess_table.txt")
+
+# Function to load the precomputed opening entropy table ("word:entropy" per line, best first)
+def load_opening_entropies(file_name):
+    opening_entropies = {}
+    with open(file_name, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                word, entropy = line.split(":")
+                opening_entropies[word] = float(entropy)
+    return opening_entropies
+
+# Function to load a second-guess table (first line "# opener:<word>", then "pattern_code:guess" per line)
+def load_second_guess_table(file_name):
+    second_guesses = [None] * NUM_PATTERNS
+    opening_guess = None
+    try:
+        with open(file_name, 'r') as file:
+            for line in file:
+                line = line.strip()
+                if line.startswith("# opener:"):
+                    opening_guess = line.split(":")[1]
+                elif line:
+                    pattern_code, guess = line.split(":")
+                    second_guesses[int(pattern_code)] = guess
+    except OSError:
+        return None, second_guesses
+    return opening_guess, second_guesses
+
+# Function to generate the best second guess for every feedback pattern the opening guess can produce
+def generate_second_guess_table(agent, opening_guess, possible_words):
+    pattern_matrix = agent.get_pattern_matrix()
+    candidate_patterns = {}
+    for word in possible_words:
+        candidate_patterns.setdefault(pattern_matrix.get_pattern_code(opening_guess, word), []).append(word)
+
+    second_guesses = [None] * NUM_PATTERNS
+    for pattern_code, candidate_words in sorted(candidate_patterns.items()):
+        second_guesses[pattern_code] = agent.choose_best_guess(agent.generate_expected_information_dictionary(candidate_words))
+    return second_guesses
+
+# Function to save a second-guess table in the format read by load_second_guess_table
+def save_second_guess_table(file_name, opening_guess, second_guesses):
+    with open(file_name, 'w') as file:
+        file.write(f"# opener:{opening_guess}\n")
+        for pattern_code, guess in enumerate(second_guesses):
+            if guess is not None:
+                file.write(f"{pattern_code}:{guess}\n")
+
+# Class to give the first two hints of a game by table lookup instead of an entropy search
+class OpeningBook:
+    def __init__(self, opening_entropy_file_name=OPENING_ENTROPY_FILE_NAME, second_guess_table_file_name=SECOND_GUESS_TABLE_FILE_NAME):
+        self.opening_entropies = load_opening_entropies(opening_entropy_file_name)
+        self.opening_guess = next(iter(self.opening_entropies))  # Table is stored best first
+        table_opening_guess, self.second_guesses = load_second_guess_table(second_guess_table_file_name)
+
+        # Ignore a second-guess table generated for a different opener
+        if table_opening_guess != self.opening_guess:
+            self.second_guesses = [None] * NUM_PATTERNS
+
+    # Method to get the best second guess after the opening guess gave a particular pattern (None if not in the table)
+    def get_second_guess(self, pattern_code):
+        return self.second_guesses[pattern_code]
+
+# Function to regenerate the second-guess table from the command line
+def main():
+    from wordle_bot import EntropyMaximisationAgent
+
+    parser = argparse.ArgumentParser(description="Generate the second-guess table used by the opening book.")
+    parser.add_argument("--output", default=SECOND_GUESS_TABLE_FILE_NAME, help="file to write the table to")
+    args = parser.parse_args()
+
+    opening_guess = next(iter(load_opening_entropies(OPENING_ENTROPY_FILE_NAME)))
+    second_guesses = generate_second_guess_table(EntropyMaximisationAgent(), opening_guess, get_allowed_words_lexicon().words)
+    save_second_guess_table(args.output, opening_guess, second_guesses)
+    print(f"Wrote {sum(guess is not None for guess in second_guesses)} second guesses for opener '{opening_guess}' to {args.output}")
+
+if __name__ == "__main__":
+    main()
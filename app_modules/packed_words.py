@@ -0,0 +1,37 @@
+from word_feedback import WORD_LENGTH
+import numpy as np
+
+ALPHABET_SIZE = 26
+LETTER_BITS = 5  # Each letter (0-25) fits in 5 bits, so a 5-letter word packs into 25 bits
+LETTER_MASK = (1 << LETTER_BITS) - 1
+LETTER_SHIFTS = np.arange(WORD_LENGTH, dtype=np.uint32) * LETTER_BITS
+
+# Function to pack a word list into a uint32 array (letter i of each word stored in bits 5i to 5i + 4)
+def pack_words(words):
+    letter_bytes = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(len(words), WORD_LENGTH)
+    letter_array = (letter_bytes - ord("a")).astype(np.uint32)
+    return np.bitwise_or.reduce(letter_array << LETTER_SHIFTS, axis=1).astype(np.uint32)
+
+# Function to unpack a uint32 array of packed words into a (words x positions) array of letter indices (0-25)
+def unpack_letter_array(packed_words):
+    return ((packed_words[:, None] >> LETTER_SHIFTS) & LETTER_MASK).astype(np.uint8)
+
+# Function to count how many times each letter appears in each word of a letter array
+def count_letters(letter_array):
+    letter_counts = np.zeros((len(letter_array), ALPHABET_SIZE), dtype=np.uint8)
+    for i in range(WORD_LENGTH):
+        np.add.at(letter_counts, (np.arange(len(letter_array)), letter_array[:, i]), 1)
+    return letter_counts
+
+# Class to hold a word list as packed integers, with each word's letter counts alongside
+class PackedWordList:
+    def __init__(self, words):
+        self.packed_words = pack_words(words)
+        self.letter_counts = count_letters(unpack_letter_array(self.packed_words))
+
+    def __len__(self):
+        return len(self.packed_words)
+
+    # Method to get the (words x positions) array of letter indices
+    def get_letter_array(self):
+        return unpack_letter_array(self.packed_words)
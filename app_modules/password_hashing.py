@@ -0,0 +1,108 @@
+from collections import OrderedDict
+import argparse
+import hashlib
+import secrets
+import hmac
+import time
+
+SALT_BYTES = 16
+
+# Cost settings used by the login benchmark (scrypt N values and PBKDF2 iteration counts)
+BENCHMARK_SCRYPT_COSTS = [2 ** 12, 2 ** 14, 2 ** 15]
+BENCHMARK_PBKDF2_COSTS = [100000, 300000, 600000]
+
+# Function to hash a password with the original rolling hash (only used to verify and migrate old accounts)
+def hash_legacy_password(password, salt):
+    hash_value = 0
+    for char in salt + password:
+        hash_value = (hash_value * 31 + ord(char)) & 0xFFFFFFFF
+        hash_value ^= (hash_value >> 16) | (hash_value << 16)
+    return format(hash_value, '08x')
+
+# Class to hash and verify passwords with a standard-library KDF, storing the cost parameters with each hash
+# Stored formats: "scrypt$<n>$<r>$<p>$<hex>", "pbkdf2_sha256$<iterations>$<hex>", or an 8-character legacy hash
+class PasswordHasher:
+    def __init__(self, algorithm="scrypt", scrypt_n=2 ** 14, scrypt_r=8, scrypt_p=1, pbkdf2_iterations=600000, verify_cache_size=1024):
+        if algorithm not in ["scrypt", "pbkdf2_sha256"]:
+            raise ValueError(f"Unsupported password hashing algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.scrypt_n = scrypt_n
+        self.scrypt_r = scrypt_r
+        self.scrypt_p = scrypt_p
+        self.pbkdf2_iterations = pbkdf2_iterations
+
+        # Recently verified logins, keyed by a keyed hash that is useless outside this process
+        self.verify_cache_size = verify_cache_size
+        self.verify_cache = OrderedDict()
+        self.verify_cache_key = secrets.token_bytes(32)
+
+    # Method to derive a key with the given stored parameters
+    def derive_key(self, password, salt, parameters):
+        if parameters[0] == "scrypt":
+            n, r, p = int(parameters[1]), int(parameters[2]), int(parameters[3])
+            return hashlib.scrypt(password.encode(), salt=salt.encode(), n=n, r=r, p=p, maxmem=256 * n * r + 2 ** 20)
+        iterations = int(parameters[1])
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations)
+
+    # Method to get the parameters new hashes are created with
+    def get_current_parameters(self):
+        if self.algorithm == "scrypt":
+            return ["scrypt", str(self.scrypt_n), str(self.scrypt_r), str(self.scrypt_p)]
+        return ["pbkdf2_sha256", str(self.pbkdf2_iterations)]
+
+    # Method to hash a password with a new random salt, returning (salt, stored hash)
+    def hash_password(self, password):
+        salt = secrets.token_hex(SALT_BYTES)
+        parameters = self.get_current_parameters()
+        return salt, "$".join(parameters + [self.derive_key(password, salt, parameters).hex()])
+
+    # Method to check a password against a stored hash (new or legacy format)
+    def verify_password(self, password, salt, stored_hash):
+        cache_key = hmac.new(self.verify_cache_key, "\0".join([password, salt, stored_hash]).encode(), hashlib.sha256).digest()
+        if cache_key in self.verify_cache:
+            self.verify_cache.move_to_end(cache_key)
+            return True
+
+        parameters = stored_hash.split("$")
+        if len(parameters) == 1:
+            password_matches = hmac.compare_digest(hash_legacy_password(password, salt), stored_hash)
+        else:
+            password_matches = hmac.compare_digest(self.derive_key(password, salt, parameters[:-1]).hex(), parameters[-1])
+
+        # Only successful logins are cached, so failed guesses always pay the full cost
+        if password_matches and self.verify_cache_size > 0:
+            self.verify_cache[cache_key] = True
+            if len(self.verify_cache) > self.verify_cache_size:
+                self.verify_cache.popitem(last=False)
+        return password_matches
+
+    # Method to check whether a stored hash should be replaced (legacy format or old cost parameters)
+    def needs_rehash(self, stored_hash):
+        return stored_hash.split("$")[:-1] != self.get_current_parameters()
+
+# Function to measure how many logins per second a hasher can verify
+def measure_logins_per_second(hasher, min_duration=1.0, use_cache=False):
+    salt, stored_hash = hasher.hash_password("benchmark password")
+    logins = 0
+    start_time = time.perf_counter()
+    while time.perf_counter() - start_time < min_duration:
+        if not use_cache:
+            hasher.verify_cache.clear()
+        hasher.verify_password("benchmark password", salt, stored_hash)
+        logins += 1
+    return logins / (time.perf_counter() - start_time)
+
+# Function to run the login throughput benchmark from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Measure login verifications per second at each password hashing cost setting.")
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds to spend on each setting")
+    args = parser.parse_args()
+
+    hashers = [(f"scrypt n={n}", PasswordHasher("scrypt", scrypt_n=n)) for n in BENCHMARK_SCRYPT_COSTS]
+    hashers += [(f"pbkdf2_sha256 iterations={iterations}", PasswordHasher("pbkdf2_sha256", pbkdf2_iterations=iterations)) for iterations in BENCHMARK_PBKDF2_COSTS]
+    for label, hasher in hashers:
+        print(f"{label}: {measure_logins_per_second(hasher, args.duration):.1f} logins/s per core")
+    print(f"Verify cache hit: {measure_logins_per_second(hashers[0][1], args.duration, use_cache=True):.0f} logins/s per core")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+from word_feedback import WORD_LENGTH, NUM_PATTERNS
+from packed_words import unpack_letter_array
+import numpy as np
+import hashlib
+import struct
+import os
+
+# Function to compute the feedback patterns for a block of guesses against every target word
+def compute_pattern_block(guess_letters, target_letters):
+    # Shape (guesses, targets, positions)
+    guesses = guess_letters[:, None, :]
+    targets = target_letters[None, :, :]
+    greens = guesses == targets
+    pattern_block = np.zeros((guess_letters.shape[0], target_letters.shape[0]), dtype=np.uint8)
+
+    for i in range(WORD_LENGTH):
+        # Count how many non-green target letters match this guess letter
+        available = np.zeros(pattern_block.shape, dtype=np.uint8)
+        for j in range(WORD_LENGTH):
+            available += (targets[:, :, j] == guesses[:, :, i]) & ~greens[:, :, j]
+
+        # Count how many earlier non-green guess letters have already claimed the same letter
+        claimed = np.zeros(pattern_block.shape, dtype=np.uint8)
+        for k in range(i):
+            claimed += (guesses[:, :, k] == guesses[:, :, i]) & ~greens[:, :, k]
+
+        yellows = ~greens[:, :, i] & (available > claimed)
+        pattern_block += (greens[:, :, i] * 2 + yellows).astype(np.uint8) * np.uint8(3 ** i)
+
+    return pattern_block
+
+# Function to compute the full guess x target feedback pattern matrix from packed word arrays
+def compute_pattern_matrix(packed_guesses, packed_targets, block_size=256):
+    guess_letters = unpack_letter_array(packed_guesses)
+    target_letters = unpack_letter_array(packed_targets)
+    pattern_matrix = np.empty((len(packed_guesses), len(packed_targets)), dtype=np.uint8)
+
+    for start in range(0, len(packed_guesses), block_size):
+        end = min(start + block_size, len(packed_guesses))
+        pattern_matrix[start:end] = compute_pattern_block(guess_letters[start:end], target_letters)
+
+    return pattern_matrix
+
+# Function to calculate the entropy (in bits) of a row of feedback patterns
+def calculate_pattern_entropy(pattern_row):
+    if len(pattern_row) == 0:
+        return 0.0
+    pattern_counts = np.bincount(pattern_row, minlength=NUM_PATTERNS)
+    pattern_counts = pattern_counts[pattern_counts > 0]
+    pattern_probabilities = pattern_counts / len(pattern_row)
+    return float(np.sum(pattern_probabilities * np.log2(1 / pattern_probabilities)))
+
+# Function to count the feedback patterns in every row of a 2D block of patterns
+def count_patterns(pattern_block, wide_row_threshold=2048):
+    num_rows, num_candidates = pattern_block.shape
+
+    # Wide rows: one bincount per row is already cheap relative to the row length
+    if num_candidates >= wide_row_threshold:
+        pattern_counts = np.empty((num_rows, NUM_PATTERNS), dtype=np.intp)
+        for i in range(num_rows):
+            pattern_counts[i] = np.bincount(pattern_block[i], minlength=NUM_PATTERNS)
+        return pattern_counts
+
+    # Narrow rows: offset each row into its own range of 243 bins, so one bincount gives every row's histogram
+    offset_block = pattern_block.astype(np.intp)
+    offset_block += np.arange(num_rows, dtype=np.intp)[:, None] * NUM_PATTERNS
+    pattern_counts = np.bincount(offset_block.ravel(), minlength=num_rows * NUM_PATTERNS)
+    return pattern_counts.reshape(num_rows, NUM_PATTERNS)
+
+# Function to calculate the entropy of every row of pattern counts in one vectorised pass
+def calculate_count_entropies(pattern_counts, num_candidates):
+    if num_candidates == 0:
+        return np.zeros(len(pattern_counts))
+
+    # H = sum(p * log2(1 / p)) = log2(n) - sum(c * log2(c)) / n, with 0 * log2(0) taken as 0
+    count_information = np.zeros(pattern_counts.shape)
+    np.log2(pattern_counts, out=count_information, where=pattern_counts > 0)
+    return np.log2(num_candidates) - np.sum(pattern_counts * count_information, axis=1) / num_candidates
+
+# Function to calculate the entropy of every row of a 2D block of feedback patterns
+def calculate_pattern_entropies(pattern_block):
+    num_rows, num_candidates = pattern_block.shape
+    if num_candidates == 0 or num_candidates >= NUM_PATTERNS:
+        return calculate_count_entropies(count_patterns(pattern_block), num_candidates)
+
+    # Fewer candidates than patterns: sum(c * log2(c)) over bins equals the sum of log2(count of its own pattern) over candidates,
+    # which touches n entries per row instead of 243
+    offset_block = pattern_block.astype(np.intp)
+    offset_block += np.arange(num_rows, dtype=np.intp)[:, None] * NUM_PATTERNS
+    pattern_counts = np.bincount(offset_block.ravel(), minlength=num_rows * NUM_PATTERNS)
+    log_counts = np.zeros(num_candidates + 1)
+    log_counts[1:] = np.log2(np.arange(1, num_candidates + 1))
+    return np.log2(num_candidates) - log_counts[pattern_counts[offset_block]].sum(axis=1) / num_candidates
+
+# Function to get the indices of the k highest scores in descending order, without sorting every score
+def get_top_k_indices(scores, k):
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    top_k_indices = np.sort(np.argpartition(-scores, k - 1)[:k])  # Sorted so ties keep word-list order
+    return top_k_indices[np.argsort(-scores[top_k_indices], kind="stable")]
+
+# Function to get a stable fingerprint of a candidate set (an array of word indices)
+def get_candidate_set_fingerprint(candidate_indices):
+    return hashlib.blake2b(np.sort(candidate_indices).astype(np.int32).tobytes(), digest_size=16).digest()
+
+# Pattern matrix cache file layout: fixed-size header followed by the raw uint8 matrix
+CACHE_MAGIC = b"WPMX"
+CACHE_VERSION = 1
+CACHE_HEADER_FORMAT = "<4sIIII32s32s"  # magic, version, word length, rows, columns, guess list hash, target list hash
+CACHE_HEADER_SIZE = 128
+
+# Function to hash a word list so a cache built from a different list can be detected
+def hash_word_list(words):
+    return hashlib.sha256("\n".join(words).encode("ascii")).digest()
+
+# Function to build the header written at the start of a pattern matrix cache file
+def build_cache_header(guess_words, target_words):
+    header = struct.pack(
+        CACHE_HEADER_FORMAT, CACHE_MAGIC, CACHE_VERSION, WORD_LENGTH,
+        len(guess_words), len(target_words), hash_word_list(guess_words), hash_word_list(target_words)
+    )
+    return header.ljust(CACHE_HEADER_SIZE, b"\0")
+
+# Function to save a pattern matrix as a flat binary cache file
+def save_pattern_matrix(file_name, guess_words, target_words, matrix):
+    temp_file_name = f"{file_name}.{os.getpid()}.tmp"
+    with open(temp_file_name, "wb") as file:
+        file.write(build_cache_header(guess_words, target_words))
+        file.write(np.ascontiguousarray(matrix, dtype=np.uint8).tobytes())
+    os.replace(temp_file_name, file_name)  # Atomic swap, so other processes never see a half-written file
+
+# Function to memory-map a cached pattern matrix (returns None if the cache is missing or stale)
+def load_pattern_matrix(file_name, guess_words, target_words):
+    try:
+        with open(file_name, "rb") as file:
+            header = file.read(CACHE_HEADER_SIZE)
+    except OSError:
+        return None
+
+    expected_header = build_cache_header(guess_words, target_words)
+    expected_size = CACHE_HEADER_SIZE + len(guess_words) * len(target_words)
+    if header != expected_header or os.path.getsize(file_name) != expected_size:
+        return None
+
+    # Read-only mapping, so every process using the cache shares the same page cache
+    return np.memmap(file_name, dtype=np.uint8, mode="r", offset=CACHE_HEADER_SIZE, shape=(len(guess_words), len(target_words)))
+
+# Function to load the cached pattern matrix for two lexicons, rebuilding the cache if it is missing or stale
+def load_or_build_pattern_matrix(file_name, guess_lexicon, target_lexicon):
+    matrix = load_pattern_matrix(file_name, guess_lexicon.words, target_lexicon.words)
+    if matrix is None:
+        matrix = compute_pattern_matrix(guess_lexicon.get_packed_words().packed_words, target_lexicon.get_packed_words().packed_words)
+        save_pattern_matrix(file_name, guess_lexicon.words, target_lexicon.words, matrix)
+        matrix = load_pattern_matrix(file_name, guess_lexicon.words, target_lexicon.words)
+    return matrix
+
+# Class to hold the precomputed feedback pattern for every (guess, target) pair
+class PatternMatrix:
+    def __init__(self, guess_lexicon, target_lexicon, matrix=None, cache_file_name=None):
+        # Word lists and word -> row/column maps are shared with the lexicons rather than copied
+        self.guess_words = guess_lexicon.words
+        self.target_words = target_lexicon.words
+        self.guess_index = guess_lexicon.index
+        self.target_index = target_lexicon.index
+        if matrix is None:
+            if cache_file_name is not None:
+                matrix = load_or_build_pattern_matrix(cache_file_name, guess_lexicon, target_lexicon)
+            else:
+                matrix = compute_pattern_matrix(guess_lexicon.get_packed_words().packed_words, target_lexicon.get_packed_words().packed_words)
+        self.matrix = matrix
+
+    # Method to look up the pattern code for a single guess and target word
+    def get_pattern_code(self, guess, target_word):
+        return int(self.matrix[self.guess_index[guess], self.target_index[target_word]])
+
+    # Method to convert a list of target words into an index array
+    def get_target_indices(self, target_words):
+        return np.fromiter((self.target_index[word] for word in target_words), dtype=np.intp, count=len(target_words))
+
+    # Method to convert a list of guess words into an index array
+    def get_guess_indices(self, guess_words):
+        return np.fromiter((self.guess_index[word] for word in guess_words), dtype=np.intp, count=len(guess_words))
+
+    # Method to calculate the expected information of a guess over a set of candidate targets
+    def calculate_expected_information(self, guess, candidate_indices=None):
+        pattern_row = self.matrix[self.guess_index[guess]]
+        if candidate_indices is not None:
+            pattern_row = pattern_row[candidate_indices]
+        return calculate_pattern_entropy(pattern_row)
+
+    # Method to calculate the expected information of many guesses over a set of candidate targets (all targets if None) in one batch
+    def calculate_expected_information_batch(self, candidate_indices=None, guess_indices=None, max_block_entries=1 << 22):
+        if guess_indices is None:
+            guess_indices = np.arange(len(self.guess_words))
+        expected_information = np.empty(len(guess_indices))
+
+        # Process guesses in blocks to bound the memory used by the (guesses x candidates) pattern block
+        num_candidates = len(self.target_words) if candidate_indices is None else len(candidate_indices)
+        block_size = max(1, max_block_entries // max(1, num_candidates))
+        for start in range(0, len(guess_indices), block_size):
+            end = min(start + block_size, len(guess_indices))
+            pattern_block = self.matrix[guess_indices[start:end]]
+            if candidate_indices is not None:
+                pattern_block = pattern_block[:, candidate_indices]
+            expected_information[start:end] = calculate_pattern_entropies(pattern_block)
+
+        return expected_information
+
+    # Method to get the k guesses with the highest expected information, as (guess index, expected information) pairs
+    def get_top_guesses(self, candidate_indices, k, guess_indices=None):
+        if guess_indices is None:
+            guess_indices = np.arange(len(self.guess_words))
+        expected_information = self.calculate_expected_information_batch(candidate_indices, guess_indices)
+        top_k_indices = get_top_k_indices(expected_information, k)
+        return [(int(guess_indices[i]), float(expected_information[i])) for i in top_k_indices]
@@ -0,0 +1,86 @@
+from pattern_matrix import hash_word_list
+from word_lexicon import get_allowed_words_lexicon, get_possible_answers_lexicon
+from collections import OrderedDict
+import threading
+import json
+import os
+
+# Solve cache file layout: a JSON object with a format version, the hashes of the word lists the keys index into, and the entries
+SOLVE_CACHE_VERSION = 1
+
+# Function to hash the word lists that solve cache keys index into (candidate masks are over allowed words or possible answers)
+def get_solve_cache_word_list_hashes():
+    return [hash_word_list(get_allowed_words_lexicon().words).hex(), hash_word_list(get_possible_answers_lexicon().words).hex()]
+
+# Function to read the entries of a solve cache file (None if the file is missing, unreadable or built from different word lists)
+def read_solve_cache_entries(file_name):
+    try:
+        with open(file_name, 'r') as file:
+            contents = json.load(file)
+        if contents["version"] != SOLVE_CACHE_VERSION or contents["word_lists"] != get_solve_cache_word_list_hashes():
+            return None
+        return contents["entries"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+# Class to cache solver results (chosen guess and top-k scores) by candidate-set fingerprint, evicting the least recently used
+class SolveCache:
+    def __init__(self, max_size=4096, file_name=None):
+        self.max_size = max_size
+        self.file_name = file_name  # If set, the cache is loaded from and saved to this file
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()  # One cache can be shared by every hint thread in a server
+        self.hits = 0
+        self.misses = 0
+        if file_name is not None:
+            self.load()
+
+    # Method to look up a cached result (None on a miss)
+    def get(self, key):
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)  # Mark as most recently used
+            self.hits += 1
+            return result
+
+    # Method to add a result, evicting the least recently used entry if the cache is full
+    def put(self, key, chosen_guess, top_guesses):
+        with self.lock:
+            self.entries[key] = (chosen_guess, top_guesses)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    # Method to get the cache's hit/miss counters
+    def get_stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+        }
+
+    # Method to save the cache to its file (least recently used first, so the order survives a reload)
+    # Entries already in the file are kept as the oldest, so processes sharing one file add to it rather than overwrite each other
+    def save(self):
+        if self.file_name is None:
+            return
+        with self.lock:
+            own_entries = [[key.hex(), chosen_guess, top_guesses] for key, (chosen_guess, top_guesses) in self.entries.items()]
+        own_keys = {entry[0] for entry in own_entries}
+        saved_entries = [entry for entry in read_solve_cache_entries(self.file_name) or [] if entry[0] not in own_keys]
+        entries = (saved_entries + own_entries)[-self.max_size:]
+
+        temp_file_name = f"{self.file_name}.{os.getpid()}.tmp"
+        with open(temp_file_name, 'w') as file:
+            json.dump({"version": SOLVE_CACHE_VERSION, "word_lists": get_solve_cache_word_list_hashes(), "entries": entries}, file)
+        os.replace(temp_file_name, self.file_name)
+
+    # Method to load the cache from its file (a missing, unreadable or stale file leaves the cache empty, and is replaced on the next save)
+    def load(self):
+        for key_hex, chosen_guess, top_guesses in read_solve_cache_entries(self.file_name) or []:
+            self.put(bytes.fromhex(key_hex), chosen_guess, [tuple(top_guess) for top_guess in top_guesses])
@@ -0,0 +1,119 @@
+from wordle_bot import EntropyMaximisationAgent, get_pattern_matrix
+from word_lexicon import get_possible_answers_lexicon
+from solve_cache import SolveCache
+from multiprocessing import Pool
+import argparse
+import time
+import os
+import numpy as np
+
+MAX_ATTEMPTS = 6
+
+# Agent used by each benchmark worker process (created once per process by the pool initialiser)
+worker_agent = None
+
+# Function to set up a benchmark worker process
+def initialise_worker(use_strategy_tree=False, lookahead_time_budget=None, solve_cache_size=None, use_answer_pool=False, use_incremental_entropy=False):
+    global worker_agent
+    solve_cache = SolveCache(solve_cache_size) if solve_cache_size else None
+    worker_agent = EntropyMaximisationAgent(use_strategy_tree, lookahead_time_budget, solve_cache, use_answer_pool, use_incremental_entropy=use_incremental_entropy)
+    worker_agent.get_pattern_matrix()  # Map the cached pattern matrix before any game is timed
+
+# Function to play a single benchmark game and time it
+def play_benchmark_game(target_word):
+    start_time = time.perf_counter()
+    guessed_correctly, attempts = worker_agent.simulate_game(target_word)
+    elapsed_time = time.perf_counter() - start_time
+    return target_word, guessed_correctly, attempts, elapsed_time
+
+# Function to play the bot against every target word across a pool of processes
+def run_benchmark(target_words, processes=None, use_strategy_tree=False, lookahead_time_budget=None, solve_cache_size=None, use_answer_pool=False, use_incremental_entropy=False):
+    get_pattern_matrix()  # Make sure the cache file exists before the workers try to map it
+    initargs = (use_strategy_tree, lookahead_time_budget, solve_cache_size, use_answer_pool, use_incremental_entropy)
+    with Pool(processes=processes, initializer=initialise_worker, initargs=initargs) as pool:
+        chunk_size = max(1, len(target_words) // ((processes or os.cpu_count() or 1) * 8))
+        results = list(pool.imap_unordered(play_benchmark_game, target_words, chunksize=chunk_size))
+    return results
+
+# Function to summarise benchmark results (win rate, average attempts, guess histogram, worst-case words and latency percentiles)
+def summarise_benchmark_results(results, worst_case_count=10):
+    num_games = len(results)
+    wins = [result for result in results if result[1]]
+    latencies = np.array([result[3] for result in results])
+
+    # Guess-count histogram, with losses counted under "X"
+    guess_histogram = {attempts: 0 for attempts in range(1, MAX_ATTEMPTS + 1)}
+    guess_histogram["X"] = 0
+    for _, guessed_correctly, attempts, _ in results:
+        guess_histogram[attempts if guessed_correctly else "X"] += 1
+
+    # Worst-case words: losses first, then the most attempts, then the slowest games
+    worst_case_results = sorted(results, key=lambda result: (result[1], -result[2], -result[3]))[:worst_case_count]
+
+    return {
+        "games": num_games,
+        "win_rate": len(wins) / num_games * 100 if num_games else 0,
+        "average_attempts": sum(result[2] for result in wins) / len(wins) if wins else 0,
+        "average_attempts_all": sum(result[2] if result[1] else MAX_ATTEMPTS for result in results) / num_games if num_games else 0,  # Losses count as MAX_ATTEMPTS
+        "guess_histogram": guess_histogram,
+        "worst_case_words": [(result[0], result[2] if result[1] else "X") for result in worst_case_results],
+        "latency_p50": float(np.percentile(latencies, 50)) if num_games else 0,
+        "latency_p95": float(np.percentile(latencies, 95)) if num_games else 0,
+        "latency_p99": float(np.percentile(latencies, 99)) if num_games else 0,
+    }
+
+# Function to format a benchmark summary as a printable report
+def format_benchmark_report(summary, total_time):
+    lines = [
+        f"Games played: {summary['games']} in {total_time:.1f}s",
+        f"Win rate: {summary['win_rate']:.2f}%",
+        f"Average attempts: {summary['average_attempts']:.4f} (wins) | {summary['average_attempts_all']:.4f} (all games, losses as {MAX_ATTEMPTS})",
+        "Guess histogram:",
+    ]
+    for attempts, count in summary["guess_histogram"].items():
+        lines.append(f"    {attempts}: {count}")
+    lines.append("Worst-case words: " + ", ".join(f"{word} ({attempts})" for word, attempts in summary["worst_case_words"]))
+    lines.append(
+        f"Per-game latency: p50 {summary['latency_p50'] * 1000:.1f}ms | "
+        f"p95 {summary['latency_p95'] * 1000:.1f}ms | p99 {summary['latency_p99'] * 1000:.1f}ms"
+    )
+    return "\n".join(lines)
+
+# Function to run the benchmark from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Play the Wordle bot against every possible answer and report its performance.")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--limit", type=int, default=None, help="only play against the first N possible answers")
+    parser.add_argument("--strategy-tree", action="store_true", help="use the precomputed strategy tree (build it with strategy_tree.py)")
+    parser.add_argument("--lookahead-budget", type=float, default=None, help="use the two-ply lookahead scorer with this time budget per hint (ms)")
+    parser.add_argument("--compare-lookahead", action="store_true", help="run the greedy agent and the lookahead agent back to back and report both")
+    parser.add_argument("--answer-pool", action="store_true", help="only keep possible answers as candidates (guesses still come from every allowed word)")
+    parser.add_argument("--compare-pools", action="store_true", help="run the allowed-word candidate pool and the answer pool back to back and report both")
+    parser.add_argument("--incremental", action="store_true", help="keep an incremental entropy engine per game instead of rescoring every guess each turn")
+    parser.add_argument("--solve-cache", type=int, default=None, help="give each worker's agent an LRU solve cache of this size")
+    parser.add_argument("--worst", type=int, default=10, help="number of worst-case words to report")
+    args = parser.parse_args()
+
+    possible_answers = get_possible_answers_lexicon().words
+    target_words = possible_answers[:args.limit] if args.limit else possible_answers
+    lookahead_time_budget = args.lookahead_budget / 1000 if args.lookahead_budget is not None else None
+
+    # Each run is (label, lookahead time budget, answer-pool mode)
+    if args.compare_lookahead:
+        runs = [("Greedy entropy", None, args.answer_pool), ("Two-ply lookahead", lookahead_time_budget or 0.05, args.answer_pool)]
+    elif args.compare_pools:
+        runs = [("Allowed-word candidates", lookahead_time_budget, False), ("Answer-pool candidates", lookahead_time_budget, True)]
+    else:
+        runs = [(None, lookahead_time_budget, args.answer_pool)]
+
+    for label, run_time_budget, use_answer_pool in runs:
+        start_time = time.perf_counter()
+        results = run_benchmark(target_words, args.processes, args.strategy_tree, run_time_budget, args.solve_cache, use_answer_pool, args.incremental)
+        total_time = time.perf_counter() - start_time
+        if label is not None:
+            print(f"{label}:")
+        print(format_benchmark_report(summarise_benchmark_results(results, args.worst), total_time))
+        print()
+
+if __name__ == "__main__":
+    main()
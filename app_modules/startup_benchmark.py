@@ -0,0 +1,52 @@
+import subprocess
+import argparse
+import statistics
+import tempfile
+import json
+import sys
+import os
+from word_lexicon import DATA_DIRECTORY
+
+APP_MODULES_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Script run in a fresh interpreter: times the import, counts data files opened during it, then times the first word-list load
+STARTUP_SCRIPT = """
+import sys, time, json
+data_files_opened = []
+data_directory = sys.argv[1]
+sys.addaudithook(lambda event, args: event == "open" and isinstance(args[0], str) and args[0].startswith(data_directory) and data_files_opened.append(args[0]))
+start_time = time.perf_counter()
+import game_logic, wordle_bot
+import_time = time.perf_counter() - start_time
+files_opened_on_import = len(data_files_opened)
+start_time = time.perf_counter()
+from word_lexicon import get_allowed_words_lexicon, get_possible_answers_lexicon
+get_allowed_words_lexicon(), get_possible_answers_lexicon()
+load_time = time.perf_counter() - start_time
+print(json.dumps({"import_time": import_time, "load_time": load_time, "files_opened_on_import": files_opened_on_import}))
+"""
+
+# Function to time a single cold start in a fresh interpreter (run from an unrelated working directory)
+def time_startup():
+    environment = dict(os.environ, PYTHONPATH=APP_MODULES_DIRECTORY)
+    with tempfile.TemporaryDirectory() as working_directory:
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT, DATA_DIRECTORY], cwd=working_directory, env=environment,
+            capture_output=True, text=True, check=True
+        ).stdout
+    return json.loads(output)
+
+# Function to run the startup benchmark from the command line
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long the game modules take to import and load their word lists.")
+    parser.add_argument("--runs", type=int, default=10, help="number of cold starts to time")
+    args = parser.parse_args()
+
+    results = [time_startup() for _ in range(args.runs)]
+    print(f"Cold starts: {args.runs} (run outside the repository root)")
+    print(f"Median import time: {statistics.median(result['import_time'] for result in results) * 1000:.1f}ms")
+    print(f"Data files opened during import: {max(result['files_opened_on_import'] for result in results)}")
+    print(f"Median first word-list load: {statistics.median(result['load_time'] for result in results) * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+from pattern_matrix import hash_word_list
+from word_feedback import ALL_GREEN_PATTERN_CODE
+from word_lexicon import DATA_DIRECTORY, get_possible_answers_lexicon
+import numpy as np
+import argparse
+import struct
+import os
+
+STRATEGY_TREE_FILE_NAME = os.path.join(DATA_DIRECTORY, "strategy_tree.bin")
+
+# Strategy tree file layout: header, then nodes in pre-order as (uint16 guess index, uint8 child count),
+# each child preceded by the uint8 pattern code that leads to it
+TREE_MAGIC = b"WDTR"
+TREE_VERSION = 1
+TREE_HEADER_FORMAT = "<4sII32s32s"  # magic, version, node count, guess list hash, answer list hash
+NODE_FORMAT = "<HB"
+CHILD_FORMAT = "<B"
+
+# Class to represent one node of the strategy tree (the guess to play and the subtree for each feedback pattern)
+class StrategyTreeNode:
+    def __init__(self, guess_index):
+        self.guess_index = guess_index
+        self.children = {}
+
+# Function to choose the guess for a set of candidate answers (highest entropy, preferring guesses that could be the answer)
+def choose_tree_guess(pattern_matrix, candidate_indices):
+    if len(candidate_indices) <= 2:
+        return int(candidate_indices[0])
+
+    expected_information = pattern_matrix.calculate_expected_information_batch(candidate_indices)
+    expected_information[candidate_indices] += 1e-6  # Tie-break towards guesses that might win immediately
+    return int(np.argmax(expected_information))
+
+# Function to recursively build the strategy tree for a set of candidate answers
+def build_strategy_subtree(pattern_matrix, candidate_indices):
+    guess_index = choose_tree_guess(pattern_matrix, candidate_indices)
+    node = StrategyTreeNode(guess_index)
+
+    # Split the candidates by the feedback pattern they would give, and build a subtree for each group
+    pattern_codes = pattern_matrix.matrix[guess_index, candidate_indices]
+    for pattern_code in np.unique(pattern_codes):
+        if pattern_code != ALL_GREEN_PATTERN_CODE:
+            node.children[int(pattern_code)] = build_strategy_subtree(pattern_matrix, candidate_indices[pattern_codes == pattern_code])
+    return node
+
+# Function to build the complete strategy tree for every possible answer
+def build_strategy_tree(pattern_matrix, answer_words):
+    return build_strategy_subtree(pattern_matrix, pattern_matrix.get_target_indices(answer_words))
+
+# Function to calculate how many guesses the tree takes to solve each answer
+def calculate_tree_guess_counts(pattern_matrix, root, answer_words):
+    guess_counts = {}
+    for answer in answer_words:
+        node = root
+        guess_count = 1
+        while pattern_matrix.guess_words[node.guess_index] != answer:
+            node = node.children[pattern_matrix.get_pattern_code(pattern_matrix.guess_words[node.guess_index], answer)]
+            guess_count += 1
+        guess_counts[answer] = guess_count
+    return guess_counts
+
+# Function to serialise a strategy tree to the compact pre-order binary format
+def serialise_strategy_tree(root, guess_words, answer_words):
+    node_data = []
+    node_count = 0
+    stack = [(None, root)]
+    while stack:
+        pattern_code, node = stack.pop()
+        if pattern_code is not None:
+            node_data.append(struct.pack(CHILD_FORMAT, pattern_code))
+        node_data.append(struct.pack(NODE_FORMAT, node.guess_index, len(node.children)))
+        node_count += 1
+        for child_pattern_code, child in sorted(node.children.items(), reverse=True):
+            stack.append((child_pattern_code, child))
+
+    header = struct.pack(TREE_HEADER_FORMAT, TREE_MAGIC, TREE_VERSION, node_count, hash_word_list(guess_words), hash_word_list(answer_words))
+    return header + b"".join(node_data)
+
+# Function to deserialise a strategy tree (returns None if the data is truncated, corrupt or for different word lists)
+def deserialise_strategy_tree(data, guess_words, answer_words):
+    header_size = struct.calcsize(TREE_HEADER_FORMAT)
+    if len(data) < header_size:
+        return None
+    magic, version, node_count, guess_list_hash, answer_list_hash = struct.unpack_from(TREE_HEADER_FORMAT, data)
+    if (magic, version, guess_list_hash, answer_list_hash) != (TREE_MAGIC, TREE_VERSION, hash_word_list(guess_words), hash_word_list(answer_words)):
+        return None
+
+    # Every node but the root is preceded by its pattern code, so the header's node count fixes the file size
+    node_size = struct.calcsize(NODE_FORMAT)
+    child_size = struct.calcsize(CHILD_FORMAT)
+    if node_count == 0 or len(data) != header_size + node_count * node_size + (node_count - 1) * child_size:
+        return None
+    try:
+        return read_strategy_tree_nodes(data, header_size, len(guess_words))
+    except (struct.error, ValueError):
+        return None
+
+# Function to read the pre-order nodes of a strategy tree starting at an offset (raises struct.error or ValueError if they are corrupt)
+def read_strategy_tree_nodes(data, offset, num_guess_words):
+    node_size = struct.calcsize(NODE_FORMAT)
+    child_size = struct.calcsize(CHILD_FORMAT)
+
+    guess_index, child_count = struct.unpack_from(NODE_FORMAT, data, offset)
+    offset += node_size
+    root = StrategyTreeNode(guess_index)
+    stack = [(root, child_count)]
+    while stack:
+        node, remaining_children = stack.pop()
+        if remaining_children == 0:
+            continue
+        stack.append((node, remaining_children - 1))
+
+        (pattern_code,) = struct.unpack_from(CHILD_FORMAT, data, offset)
+        guess_index, child_count = struct.unpack_from(NODE_FORMAT, data, offset + child_size)
+        offset += child_size + node_size
+        if guess_index >= num_guess_words:
+            raise ValueError(f"Guess index {guess_index} is out of range")
+        child = StrategyTreeNode(guess_index)
+        node.children[pattern_code] = child
+        stack.append((child, child_count))
+    if offset != len(data) or root.guess_index >= num_guess_words:
+        raise ValueError("Node data does not match the node count")
+    return root
+
+# Class to answer hints by walking a precomputed strategy tree
+class StrategyTree:
+    def __init__(self, root, guess_words):
+        self.root = root
+        self.guess_words = guess_words
+
+    # Method to get the next guess after a sequence of (guess, pattern code) pairs (None if the game has left the tree)
+    def get_guess(self, guess_history):
+        node = self.root
+        for guess, pattern_code in guess_history:
+            if self.guess_words[node.guess_index] != guess:
+                return None
+            node = node.children.get(pattern_code)
+            if node is None:
+                return None
+        return self.guess_words[node.guess_index]
+
+# Function to load a strategy tree file (returns None if the file is missing or was built from different word lists)
+def load_strategy_tree(file_name, guess_words, answer_words):
+    try:
+        with open(file_name, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    root = deserialise_strategy_tree(data, guess_words, answer_words)
+    if root is None:
+        return None
+    return StrategyTree(root, guess_words)
+
+# Function to build the strategy tree from the command line and report its quality
+def main():
+    from wordle_bot import get_pattern_matrix
+
+    parser = argparse.ArgumentParser(description="Build the precomputed strategy tree used by the decision-tree solver.")
+    parser.add_argument("--output", default=STRATEGY_TREE_FILE_NAME, help="file to write the tree to")
+    args = parser.parse_args()
+
+    pattern_matrix = get_pattern_matrix()
+    answer_words = get_possible_answers_lexicon().words
+    root = build_strategy_tree(pattern_matrix, answer_words)
+    temp_file_name = f"{args.output}.{os.getpid()}.tmp"
+    with open(temp_file_name, "wb") as file:
+        file.write(serialise_strategy_tree(root, pattern_matrix.guess_words, answer_words))
+    os.replace(temp_file_name, args.output)  # Atomic swap, so a running game never reads a half-written tree
+
+    guess_counts = calculate_tree_guess_counts(pattern_matrix, root, answer_words)
+    print(f"Opening guess: {pattern_matrix.guess_words[root.guess_index]}")
+    print(f"Expected guess count: {sum(guess_counts.values()) / len(guess_counts):.4f}")
+    print(f"Maximum depth: {max(guess_counts.values())}")
+    print(f"Wrote strategy tree to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import threading
+import select
+import queue
+import time
+import sys
+import os
+
+# Class to write game output to the terminal, one buffered write per frame, with an optional non-blocking typewriter animation
+# Animation is off when the output is not a terminal (scripted or automated sessions) or when animate=False (headless mode)
+class TerminalRenderer:
+    def __init__(self, output=None, animate=None, char_delay=0.05):
+        self.output = output or sys.stdout
+        self.animate = self.output.isatty() if animate is None else animate
+        self.char_delay = char_delay
+        self.animation_queue = queue.Queue()  # Text waiting to be typed out by the animation thread
+        self.skip_event = threading.Event()  # Set to type out everything queued immediately
+        self.animation_thread = None
+
+    # Method to write text immediately as a single write, after any animation that is still playing
+    def write(self, text):
+        self.wait_for_animation()
+        self.output.write(text)
+        self.output.flush()
+
+    # Method to write one complete frame (a list of lines) as a single write
+    def write_frame(self, lines):
+        self.write("\n".join(lines) + "\n")
+
+    # Method to type text out like a typewriter without blocking the caller (written at once in headless mode)
+    def typewriter(self, text):
+        if not self.animate:
+            self.write(text)
+            return
+        if self.animation_thread is None:
+            self.animation_thread = threading.Thread(target=self.run_animation, daemon=True)
+            self.animation_thread.start()
+        self.animation_queue.put(text)
+
+    # Method to finish any animation at once
+    def skip_animation(self):
+        if self.animation_thread is not None:
+            self.skip_event.set()
+            self.animation_queue.join()
+            self.skip_event.clear()
+
+    # Method to wait for queued animation to finish; pressing Enter while waiting skips the rest of it
+    def wait_for_animation(self):
+        if self.animation_thread is None:
+            return
+        can_skip = os.name == "posix" and sys.stdin.isatty()
+        while self.animation_queue.unfinished_tasks:
+            if can_skip and select.select([sys.stdin], [], [], 0.05)[0]:
+                sys.stdin.readline()  # The key press only skips the animation, it is not input
+                self.skip_animation()
+            elif not can_skip:
+                time.sleep(0.05)
+
+    # Method to read a line of input; the prompt animates while the player types, and submitting skips what is left of it
+    def read_input(self, prompt=""):
+        self.typewriter(prompt)
+        user_input = input()
+        self.skip_animation()
+        return user_input
+
+    # Method run on the animation thread to type out queued text
+    def run_animation(self):
+        while True:
+            text = self.animation_queue.get()
+            for i, char in enumerate(text):
+                if self.skip_event.is_set():
+                    self.output.write(text[i:])
+                    break
+                self.output.write(char)
+                self.output.flush()
+                time.sleep(self.char_delay)
+            self.output.flush()
+            self.animation_queue.task_done()
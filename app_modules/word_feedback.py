@@ -0,0 +1,48 @@
+from functools import lru_cache
+
+WORD_LENGTH = 5
+NUM_PATTERNS = 3 ** WORD_LENGTH  # 243 possible feedback patterns
+
+# Values of each tile in a base-3 coded pattern ("B" = 0, "Y" = 1, "G" = 2), position i has weight 3 ** i
+PATTERN_DIGITS = {"B": 0, "Y": 1, "G": 2}
+PATTERN_LETTERS = ["B", "Y", "G"]
+POSITION_WEIGHTS = tuple(3 ** i for i in range(WORD_LENGTH))
+ALL_GREEN_PATTERN_CODE = NUM_PATTERNS - 1  # "GGGGG"
+
+# Function to calculate the Wordle feedback for a guess as a base-3 integer (0-242), handling repeated letters correctly
+@lru_cache(maxsize=1 << 16)
+def get_feedback_code(guess, target_word):
+    pattern_code = 0
+    unmatched_letters = ""  # Target letters not matched by a green, each can turn at most one guess letter yellow
+
+    # First pass (greens)
+    for i in range(WORD_LENGTH):
+        if guess[i] == target_word[i]:
+            pattern_code += 2 * POSITION_WEIGHTS[i]
+        else:
+            unmatched_letters += target_word[i]
+
+    # Second pass (yellows, left to right, consuming unmatched target letters)
+    if unmatched_letters:
+        for i in range(WORD_LENGTH):
+            letter = guess[i]
+            if letter != target_word[i] and letter in unmatched_letters:
+                pattern_code += POSITION_WEIGHTS[i]
+                unmatched_letters = unmatched_letters.replace(letter, "", 1)
+
+    return pattern_code
+
+# Function to convert a coded guess pattern (e.g. ["G", "B", "Y", "B", "B"]) into a base-3 integer (0-242)
+def encode_coded_guess_pattern(coded_guess_pattern):
+    pattern_code = 0
+    for i in range(len(coded_guess_pattern) - 1, -1, -1):
+        pattern_code = pattern_code * 3 + PATTERN_DIGITS[coded_guess_pattern[i]]
+    return pattern_code
+
+# Function to convert a base-3 integer (0-242) back into a coded guess pattern
+def decode_pattern_code(pattern_code, word_length=WORD_LENGTH):
+    coded_guess_pattern = []
+    for _ in range(word_length):
+        coded_guess_pattern.append(PATTERN_LETTERS[pattern_code % 3])
+        pattern_code //= 3
+    return coded_guess_pattern
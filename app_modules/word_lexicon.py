@@ -0,0 +1,51 @@
+from packed_words import PackedWordList
+import os
+
+# Data files are resolved relative to the package, so the program works from any working directory
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+POSSIBLE_ANSWERS_FILE_NAME = os.path.join(DATA_DIRECTORY, "possible_answers.txt")
+ALLOWED_WORDS_FILE_NAME = os.path.join(DATA_DIRECTORY, "allowed_words.txt")
+
+# Function to convert a text file with one word per line into a list
+def load_word_list(file_name):
+    with open(file_name, 'r') as file:
+        words = file.read().split()
+    return words
+
+# Class to hold a word list with O(1) validation and word -> index (pattern-matrix row) lookup
+class WordLexicon:
+    def __init__(self, words):
+        self.words = list(words)
+        self.word_set = frozenset(self.words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.packed_words = None
+
+    # Method to get the word list as packed 25-bit integers with letter counts (built on first use)
+    def get_packed_words(self):
+        if self.packed_words is None:
+            self.packed_words = PackedWordList(self.words)
+        return self.packed_words
+
+    def __contains__(self, word):
+        return word in self.word_set
+
+    def __len__(self):
+        return len(self.words)
+
+# Shared lexicons (each word list is loaded once per process on first use, so importing this module does no I/O)
+possible_answers_lexicon = None
+allowed_words_lexicon = None
+
+# Function to get the shared lexicon of possible answers
+def get_possible_answers_lexicon():
+    global possible_answers_lexicon
+    if possible_answers_lexicon is None:
+        possible_answers_lexicon = WordLexicon(load_word_list(POSSIBLE_ANSWERS_FILE_NAME))
+    return possible_answers_lexicon
+
+# Function to get the shared lexicon of allowed guesses
+def get_allowed_words_lexicon():
+    global allowed_words_lexicon
+    if allowed_words_lexicon is None:
+        allowed_words_lexicon = WordLexicon(load_word_list(ALLOWED_WORDS_FILE_NAME))
+    return allowed_words_lexicon
@@ -1,18 +1,28 @@
-import math
 import time
+import os
+import numpy as np
+from pattern_matrix import PatternMatrix, get_top_k_indices, get_candidate_set_fingerprint
+from opening_book import OpeningBook
+from strategy_tree import load_strategy_tree, STRATEGY_TREE_FILE_NAME
+from lookahead import LookaheadScorer
+from incremental_entropy import IncrementalEntropyEngine
+from anytime_hints import get_guess_order, generate_anytime_hints
+from hard_mode import PositionalWordIndex, get_hard_mode_violation
+from multi_board import calculate_multi_board_entropies, generate_anytime_multi_board_hints
+from word_feedback import get_feedback_code, encode_coded_guess_pattern, decode_pattern_code
+from word_lexicon import get_possible_answers_lexicon, get_allowed_words_lexicon, DATA_DIRECTORY
 
-def load_possible_answers(file_name):
-    with open(file_name, 'r') as file:
-        possible_answers = [line.strip() for line in file.readlines()]
-    return possible_answers
+PATTERN_MATRIX_FILE_NAME = os.path.join(DATA_DIRECTORY, "pattern_matrix.bin")
+ANSWER_PATTERN_MATRIX_FILE_NAME = os.path.join(DATA_DIRECTORY, "answer_pattern_matrix.bin")
+LOOKAHEAD_TOP_N = 10  # Guesses the two-ply scorer evaluates per hint
 
-def load_allowed_words(file_name):
-    with open(file_name, 'r') as file:
-        allowed_words = [line.strip() for line in file.readlines()]
-    return allowed_words
-
-POSSIBLE_ANSWERS = load_possible_answers("data/possible_answers.txt")
-ALLOWED_WORDS = load_allowed_words("data/allowed_words.txt")
+# Word lists are loaded on first access rather than at import time (POSSIBLE_ANSWERS, ALLOWED_WORDS)
+def __getattr__(name):
+    if name == "POSSIBLE_ANSWERS":
+        return get_possible_answers_lexicon().words
+    if name == "ALLOWED_WORDS":
+        return get_allowed_words_lexicon().words
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Function to generate a random number (linear congruential generator)
 def generate_random_number(multiplier, increment, modulus):
@@ -20,21 +30,140 @@ def generate_random_number(multiplier, increment, modulus):
     random_number = (multiplier * seed + increment) % modulus
     return random_number
 
+# Shared pattern matrix (loaded on first use from the on-disk cache, which is built if missing or stale)
+pattern_matrix = None
+
+# Function to get the shared allowed x allowed feedback pattern matrix
+def get_pattern_matrix():
+    global pattern_matrix
+    if pattern_matrix is None:
+        pattern_matrix = PatternMatrix(get_allowed_words_lexicon(), get_allowed_words_lexicon(), cache_file_name=PATTERN_MATRIX_FILE_NAME)
+    return pattern_matrix
+
+# Shared allowed x possible-answers pattern matrix (used by answer-pool agents, about 5x narrower than the allowed x allowed matrix)
+answer_pattern_matrix = None
+
+# Function to get the shared allowed x possible-answers feedback pattern matrix
+def get_answer_pattern_matrix():
+    global answer_pattern_matrix
+    if answer_pattern_matrix is None:
+        answer_pattern_matrix = PatternMatrix(get_allowed_words_lexicon(), get_possible_answers_lexicon(), cache_file_name=ANSWER_PATTERN_MATRIX_FILE_NAME)
+    return answer_pattern_matrix
+
+# Shared opening book (first-move entropy table and second-guess table)
+opening_book = None
+
+# Function to get the shared opening book
+def get_opening_book():
+    global opening_book
+    if opening_book is None:
+        opening_book = OpeningBook()
+    return opening_book
+
+# Shared guess ranks (each allowed word's position in the opening entropy table, the order anytime hints try guesses in)
+guess_ranks = None
+
+# Function to get the shared guess ranks (both pattern matrices use the allowed word list as guesses)
+def get_guess_ranks():
+    global guess_ranks
+    if guess_ranks is None:
+        guess_order = get_guess_order(get_allowed_words_lexicon().words, get_opening_book().opening_entropies)
+        guess_ranks = np.empty(len(guess_order), dtype=np.intp)
+        guess_ranks[guess_order] = np.arange(len(guess_order))
+    return guess_ranks
+
+# Shared positional inverted index over the allowed words (used to find hard-mode legal guesses)
+positional_word_index = None
+
+# Function to get the shared positional word index
+def get_positional_word_index():
+    global positional_word_index
+    if positional_word_index is None:
+        positional_word_index = PositionalWordIndex(get_allowed_words_lexicon().get_packed_words())
+    return positional_word_index
+
+# Shared strategy tree (None until loaded, False if there is no usable tree file)
+strategy_tree = None
+
+# Function to get the shared precomputed strategy tree (None if it has not been built for the current word lists)
+def get_strategy_tree():
+    global strategy_tree
+    if strategy_tree is None:
+        strategy_tree = load_strategy_tree(STRATEGY_TREE_FILE_NAME, get_allowed_words_lexicon().words, get_possible_answers_lexicon().words) or False
+    return strategy_tree or None
+
 class EntropyMaximisationAgent:
+    def __init__(self, use_strategy_tree=False, lookahead_time_budget=None, solve_cache=None, use_answer_pool=False, hard_mode=False, use_incremental_entropy=False):
+        self.pattern_matrix = None
+        self.opening_book = None
+        self.use_strategy_tree = use_strategy_tree
+        self.lookahead_time_budget = lookahead_time_budget  # Seconds per hint for the two-ply scorer (None = greedy entropy only)
+        self.lookahead_scorer = None
+        self.solve_cache = solve_cache  # Optional SolveCache shared by every game this agent plays
+        self.use_answer_pool = use_answer_pool  # Candidates are only possible answers, guesses are still scored across every allowed word
+        self.candidate_guess_indices = None
+        self.hard_mode = hard_mode  # Guesses must keep revealed greens in place and reuse revealed letters
+        self.use_incremental_entropy = use_incremental_entropy  # simulate_game keeps an IncrementalEntropyEngine in step with its candidates
+
+    # Method to get the pattern matrix used by this agent (candidate masks index its target words)
+    def get_pattern_matrix(self):
+        if self.pattern_matrix is None:
+            self.pattern_matrix = get_answer_pattern_matrix() if self.use_answer_pool else get_pattern_matrix()
+        return self.pattern_matrix
+
+    # Method to convert candidate (target) indices into the same words' guess indices
+    def get_candidate_guess_indices(self, candidate_indices):
+        if not self.use_answer_pool:
+            return candidate_indices  # Guesses and targets are the same word list
+        if self.candidate_guess_indices is None:
+            pattern_matrix = self.get_pattern_matrix()
+            self.candidate_guess_indices = np.array([pattern_matrix.guess_index[word] for word in pattern_matrix.target_words], dtype=np.intp)
+        return self.candidate_guess_indices[candidate_indices]
+
+    # Method to get the opening book used by this agent
+    def get_opening_book(self):
+        if self.opening_book is None:
+            self.opening_book = get_opening_book()
+        return self.opening_book
+
+    # Method to get the precomputed opening guess
+    def get_opening_guess(self):
+        if self.use_strategy_tree and get_strategy_tree() is not None:
+            return get_strategy_tree().get_guess([])
+        return self.get_opening_book().opening_guess
+
+    # Method to look up the next guess in the precomputed strategy tree (None if tree mode is off, the game has left the tree or the guess breaks hard mode)
+    def get_tree_guess(self, guess_history):
+        if not self.use_strategy_tree or get_strategy_tree() is None:
+            return None
+        tree_guess = get_strategy_tree().get_guess(guess_history)
+        if tree_guess is None or not self.is_legal_guess(tree_guess, guess_history):
+            return None
+        return tree_guess
+
+    # Method to look up the precomputed second guess (None if the first guess was not the opener or the pattern is not in the table)
+    def get_second_guess(self, first_guess, first_guess_pattern_code):
+        opening_book = self.get_opening_book()
+        if self.use_answer_pool or first_guess != opening_book.opening_guess:  # The table was generated for the allowed-word candidate set
+            return None
+        second_guess = opening_book.get_second_guess(first_guess_pattern_code)
+        if second_guess is None or not self.is_legal_guess(second_guess, [(first_guess, first_guess_pattern_code)]):
+            return None
+        return second_guess
+
+    # Method to check whether a guess may be played after some (guess, pattern code) history (always true outside hard mode)
+    def is_legal_guess(self, guess, guess_history):
+        return not self.hard_mode or get_hard_mode_violation(guess, guess_history) is None
+
+    # Method to get the mask of guesses that may be played after some history (None if every allowed word may be played)
+    # Outside answer-pool mode guesses come from the candidates, which are always hard-mode legal, so no mask is needed
+    def get_legal_guess_mask(self, guess_history):
+        if not self.hard_mode or not self.use_answer_pool or not guess_history:
+            return None
+        return get_positional_word_index().get_hard_mode_mask(guess_history)
+
     def get_coded_guess_pattern(self, guess, target_word):
-        coded_guess_pattern = ["B", "B", "B", "B", "B"]
-        target_word = list(target_word)
-
-        for i in range(len(guess)):
-            if guess[i] == target_word[i]:
-                coded_guess_pattern[i] = "G"
-                target_word[i] = None
-        for i in range(len(guess)):
-            if coded_guess_pattern[i] != "G" and guess[i] in target_word:
-                coded_guess_pattern[i] = "Y"
-                target_word[target_word.index(guess[i])] = None
-
-        return coded_guess_pattern
+        return decode_pattern_code(get_feedback_code(guess, target_word))
     
     def generate_coded_guess_pattern_combinations(self):
         combinations_list = []
@@ -50,54 +179,243 @@ class EntropyMaximisationAgent:
         return combinations_list
 
     def calculate_guess_pattern_probability(self, guess, coded_guess_pattern, possible_words):
-        possible_words_before_guess = possible_words
-
-        for i in range(len(guess)):
-            if coded_guess_pattern[i] == "G":
-                possible_words = [word for word in possible_words if guess[i] == word[i]]
-            elif coded_guess_pattern[i] == "Y":
-                possible_words = [word for word in possible_words if guess[i] in word and guess[i] != word[i]]
-            elif coded_guess_pattern[i] == "B":
-                possible_words = [word for word in possible_words if guess[i] not in word]
-
-        possible_words_after_guess = possible_words
-        
-        if len(possible_words_before_guess) == 0:
+        if len(possible_words) == 0:
             return 0 
-        
-        guess_pattern_probability = len(possible_words_after_guess) / len(possible_words_before_guess)
+
+        # Count the words that would give exactly this pattern (handles repeated letters correctly)
+        pattern_code = encode_coded_guess_pattern(coded_guess_pattern)
+        matching_words = sum(1 for word in possible_words if get_feedback_code(guess, word) == pattern_code)
+        guess_pattern_probability = matching_words / len(possible_words)
         return guess_pattern_probability
     
-    def calculate_expected_information(self, guess):
-        guess_pattern_combinations = self.generate_coded_guess_pattern_combinations()
-        expected_information = 0
-
-        for guess_pattern in guess_pattern_combinations:
-            guess_pattern_probability = self.calculate_guess_pattern_probability(guess, guess_pattern, ALLOWED_WORDS)
-            if guess_pattern_probability > 0:
-                expected_information += guess_pattern_probability * math.log(1 / guess_pattern_probability, 2)
+    def calculate_expected_information(self, guess, possible_words=None):
+        pattern_matrix = self.get_pattern_matrix()
 
-        return expected_information
+        # Entropy is a bincount over the guess's row of the precomputed pattern matrix (all allowed words by default)
+        candidate_indices = None
+        if possible_words is not None:
+            candidate_indices = pattern_matrix.get_target_indices(possible_words)
+        return pattern_matrix.calculate_expected_information(guess, candidate_indices)
 
-    def generate_expected_information_dictionary(self, word_list):
-        expected_information_dict = {}
-        possible_words = word_list
+    def generate_expected_information_dictionary(self, word_list, candidate_words=None):
+        pattern_matrix = self.get_pattern_matrix()
 
-        for word in possible_words:
-            expected_information = round(self.calculate_expected_information(word), 3)
-            expected_information_dict[word] = expected_information
+        # Guesses are scored over the candidate set (the guess list itself by default) in one batch
+        # Guesses index the matrix rows and candidates its columns, which are different word lists in answer-pool mode
+        guess_indices = pattern_matrix.get_guess_indices(word_list)
+        candidate_indices = pattern_matrix.get_target_indices(word_list if candidate_words is None else candidate_words)
+        expected_information = self.calculate_expected_information_batch(candidate_indices, guess_indices)
 
-        sorted_expected_information_dict = dict(sorted(expected_information_dict.items(), key=lambda item: item[1], reverse=True))
+        sorted_indices = get_top_k_indices(expected_information, len(word_list))
+        sorted_expected_information_dict = {word_list[i]: round(float(expected_information[i]), 3) for i in sorted_indices}
         return sorted_expected_information_dict
 
+    # Method to score guesses for a candidate mask in order of promise until a time budget (seconds) runs out
+    # Yields (best guess so far, its score or None, guesses scored, total guesses); the first yield is immediate
+    def generate_anytime_guesses(self, candidate_mask, time_budget, legal_guess_mask=None):
+        deadline = time.monotonic() + time_budget
+        pattern_matrix = self.get_pattern_matrix()
+        candidate_indices = np.flatnonzero(candidate_mask)
+        candidate_guess_indices = self.get_candidate_guess_indices(candidate_indices)
+
+        # Same guess pools as solve_candidate_set: every allowed word in answer-pool mode, otherwise the candidates themselves
+        if self.use_answer_pool and len(candidate_indices) > 2:
+            guess_indices, win_bonus_indices = np.argsort(get_guess_ranks(), kind="stable"), candidate_guess_indices
+            if legal_guess_mask is not None:
+                guess_indices = guess_indices[legal_guess_mask[guess_indices]]
+        else:
+            guess_indices, win_bonus_indices = candidate_guess_indices[np.argsort(get_guess_ranks()[candidate_guess_indices], kind="stable")], None
+
+        for best_index, best_score, guesses_scored, total_guesses in generate_anytime_hints(pattern_matrix, candidate_indices, guess_indices, deadline, win_bonus_indices):
+            yield pattern_matrix.guess_words[best_index], best_score, guesses_scored, total_guesses
+
+    # Method to choose a guess for a candidate mask within a time budget (seconds), reporting progress to an optional callback
+    def choose_guess_with_deadline(self, candidate_mask, time_budget, progress_callback=None, legal_guess_mask=None):
+        cache_key = None
+        if self.solve_cache is not None:
+            cache_key = self.get_solve_cache_key(np.flatnonzero(candidate_mask), b"G", legal_guess_mask)
+            cached_result = self.solve_cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result[0]
+
+        for progress in self.generate_anytime_guesses(candidate_mask, time_budget, legal_guess_mask):
+            if progress_callback is not None:
+                progress_callback(*progress)
+        best_guess, best_score, guesses_scored, total_guesses = progress
+
+        # Only complete searches are cached, a search cut short may not have found the best guess
+        if cache_key is not None and guesses_scored == total_guesses:
+            self.solve_cache.put(cache_key, best_guess, [(best_guess, best_score)])
+        return best_guess
+
+    # Method to create an incremental entropy engine for a game's candidate mask (call its update method with each narrowed mask)
+    # Outside answer-pool mode later guesses come from the candidates, so only the current candidates are tracked as guesses
+    def create_incremental_entropy_engine(self, candidate_mask):
+        guess_indices = None if self.use_answer_pool else self.get_candidate_guess_indices(np.flatnonzero(candidate_mask))
+        return IncrementalEntropyEngine(self.get_pattern_matrix(), candidate_mask, guess_indices)
+
+    # Method to get the solve cache key for a candidate set
+    # Greedy and lookahead results for the same candidate set are cached separately, as are the two guess pools and hard-mode guess sets
+    def get_solve_cache_key(self, candidate_indices, solver_tag, legal_guess_mask=None):
+        cache_key = get_candidate_set_fingerprint(candidate_indices) + solver_tag
+        if self.use_answer_pool:
+            cache_key += b"A"
+        if legal_guess_mask is not None:
+            cache_key += get_candidate_set_fingerprint(np.flatnonzero(legal_guess_mask))
+        return cache_key
+
+    # Method to choose the next guess for a candidate mask, using the solve cache if the agent has one
+    # legal_guess_mask (from get_legal_guess_mask) restricts the guesses considered in hard mode
+    # entropy_engine (from create_incremental_entropy_engine, updated to candidate_mask) replaces scoring every guess from scratch
+    def choose_guess_from_mask(self, candidate_mask, legal_guess_mask=None, entropy_engine=None):
+        candidate_indices = np.flatnonzero(candidate_mask)
+        cache_key = None
+        if self.solve_cache is not None:
+            cache_key = self.get_solve_cache_key(candidate_indices, b"G" if self.lookahead_time_budget is None else b"L", legal_guess_mask)
+            cached_result = self.solve_cache.get(cache_key)
+            if cached_result is not None:
+                return cached_result[0]
+
+        chosen_guess, top_guesses = self.solve_candidate_set(candidate_indices, legal_guess_mask=legal_guess_mask, entropy_engine=entropy_engine)
+        if cache_key is not None:
+            self.solve_cache.put(cache_key, chosen_guess, top_guesses)
+        return chosen_guess
+
+    # Method to choose the next guess for a candidate set (two-ply lookahead if enabled, otherwise greedy entropy), along with the top-k entropy scores
+    def solve_candidate_set(self, candidate_indices, k=5, legal_guess_mask=None, entropy_engine=None):
+        expected_information = None
+        if entropy_engine is not None:
+            expected_information = np.full(len(self.get_pattern_matrix().guess_words), -np.inf)  # Untracked guesses are never chosen
+            # Rounded so the drift left by incremental subtraction cannot break ties between equally good guesses
+            expected_information[entropy_engine.guess_indices] = np.round(entropy_engine.get_expected_information(), 9)
+        if self.use_answer_pool:
+            top_guesses = self.get_answer_pool_top_guesses(candidate_indices, k, legal_guess_mask, expected_information)
+        elif self.lookahead_time_budget is None:
+            top_guesses = self.get_top_guesses(candidate_indices, k, candidate_indices, expected_information)
+        else:
+            # Enough guesses for the lookahead shortlist too, so the scorer does not score the whole candidate set again
+            top_guesses = self.get_top_guesses(candidate_indices, max(k, LOOKAHEAD_TOP_N), candidate_indices, expected_information)
+        if self.lookahead_time_budget is None:
+            return top_guesses[0][0], top_guesses
+
+        # The lookahead scorer plays candidates as guesses, so it always works on the square allowed x allowed matrix
+        pattern_matrix = get_pattern_matrix()
+        if self.lookahead_scorer is None:
+            self.lookahead_scorer = LookaheadScorer(pattern_matrix, top_n=LOOKAHEAD_TOP_N, time_budget=self.lookahead_time_budget)
+        shortlist = None if self.use_answer_pool else pattern_matrix.get_guess_indices([guess for guess, _ in top_guesses])
+        best_guess_index = self.lookahead_scorer.choose_best_guess(self.get_candidate_guess_indices(candidate_indices), shortlist)
+        return pattern_matrix.guess_words[best_guess_index], top_guesses[:k]
+
+    # Method to get the solve cache's hit/miss counters (None if the agent has no cache)
+    def get_solve_cache_stats(self):
+        if self.solve_cache is None:
+            return None
+        return self.solve_cache.get_stats()
+
+    # Method to save the solve cache to disk (if it was created with a file name)
+    def save_solve_cache(self):
+        if self.solve_cache is not None:
+            self.solve_cache.save()
+
+    # Method to get the candidate mask at the start of a game (every allowed word, or every possible answer in answer-pool mode)
+    def get_initial_candidate_mask(self):
+        return np.ones(len(self.get_pattern_matrix().target_words), dtype=bool)
+
+    # Method to narrow a candidate mask after a guess, keeping only words that would have given the same pattern
+    def narrow_candidate_mask(self, candidate_mask, guess, pattern_code):
+        pattern_matrix = self.get_pattern_matrix()
+        return candidate_mask & (pattern_matrix.matrix[pattern_matrix.guess_index[guess]] == pattern_code)
+
+    def calculate_expected_information_batch(self, candidate_indices, guess_indices=None):
+        return self.get_pattern_matrix().calculate_expected_information_batch(candidate_indices, guess_indices)
+
+    # expected_information (every guess's score, e.g. from an incremental entropy engine) skips scoring the guesses again
+    def get_top_guesses(self, candidate_indices, k, guess_indices=None, expected_information=None):
+        pattern_matrix = self.get_pattern_matrix()
+        if expected_information is None:
+            top_guesses = pattern_matrix.get_top_guesses(candidate_indices, k, guess_indices)
+            return [(pattern_matrix.guess_words[i], score) for i, score in top_guesses]
+        if guess_indices is None:
+            guess_indices = np.arange(len(pattern_matrix.guess_words))
+        guess_information = expected_information[guess_indices]
+        return [(pattern_matrix.guess_words[guess_indices[i]], float(guess_information[i])) for i in get_top_k_indices(guess_information, k)]
+
+    # Method to score every allowed word as a guess against the remaining answers, returning the top k (guess, score) pairs
+    # A guess that is itself a candidate also wins outright with probability 1/n, which is added to its score
+    def get_answer_pool_top_guesses(self, candidate_indices, k, legal_guess_mask=None, expected_information=None):
+        pattern_matrix = self.get_pattern_matrix()
+        scores = pattern_matrix.calculate_expected_information_batch(candidate_indices) if expected_information is None else expected_information
+        scores[self.get_candidate_guess_indices(candidate_indices)] += 1 / len(candidate_indices)
+        if legal_guess_mask is not None:
+            scores[~legal_guess_mask] = -np.inf
+        return [(pattern_matrix.guess_words[i], float(scores[i])) for i in get_top_k_indices(scores, k)]
+
+    # Method to get the guess for a board with one candidate left, which is played outright (None if every board has several)
+    def get_multi_board_solved_guess(self, candidate_masks):
+        for candidate_mask in candidate_masks:
+            candidate_indices = np.flatnonzero(candidate_mask)
+            if len(candidate_indices) == 1:
+                return self.get_pattern_matrix().target_words[candidate_indices[0]]
+        return None
+
+    # Method to get the guesses to score for several boards and each guess's win bonus (1/n for each board where it is one of the n candidates)
+    # Outside answer-pool mode guesses come from the candidates of any board, as on a single board
+    def get_multi_board_guess_pool(self, board_candidate_indices):
+        pattern_matrix = self.get_pattern_matrix()
+        guess_indices = np.arange(len(pattern_matrix.guess_words)) if self.use_answer_pool else np.unique(np.concatenate(board_candidate_indices))
+        win_bonus = np.zeros(len(pattern_matrix.guess_words))
+        for candidate_indices in board_candidate_indices:
+            win_bonus[self.get_candidate_guess_indices(candidate_indices)] += 1 / len(candidate_indices)
+        return guess_indices, win_bonus
+
+    # Method to choose one guess for several boards at once, from the candidate mask of each unsolved board
+    # A board with one candidate left is guessed outright; otherwise guesses are scored by their entropy summed over every board,
+    # plus 1/n for each board where the guess is itself one of the n candidates
+    def choose_multi_board_guess(self, candidate_masks):
+        solved_guess = self.get_multi_board_solved_guess(candidate_masks)
+        if solved_guess is not None:
+            return solved_guess
+
+        pattern_matrix = self.get_pattern_matrix()
+        board_candidate_indices = [np.flatnonzero(candidate_mask) for candidate_mask in candidate_masks]
+        guess_indices, win_bonus = self.get_multi_board_guess_pool(board_candidate_indices)
+        scores = calculate_multi_board_entropies(pattern_matrix, board_candidate_indices, guess_indices).sum(axis=1) + win_bonus[guess_indices]
+        return pattern_matrix.guess_words[guess_indices[int(np.argmax(scores))]]
+
+    # Method to score guesses for several boards in order of promise until a time budget (seconds) runs out
+    # Yields (best guess so far, its score or None, guesses scored, total guesses); the first yield is immediate
+    def generate_anytime_multi_board_guesses(self, candidate_masks, time_budget):
+        deadline = time.monotonic() + time_budget
+        pattern_matrix = self.get_pattern_matrix()
+        board_candidate_indices = [np.flatnonzero(candidate_mask) for candidate_mask in candidate_masks]
+        guess_indices, win_bonus = self.get_multi_board_guess_pool(board_candidate_indices)
+        guess_indices = guess_indices[np.argsort(get_guess_ranks()[guess_indices], kind="stable")]
+
+        for best_index, best_score, guesses_scored, total_guesses in generate_anytime_multi_board_hints(pattern_matrix, board_candidate_indices, guess_indices, deadline, win_bonus):
+            yield pattern_matrix.guess_words[best_index], best_score, guesses_scored, total_guesses
+
+    # Method to choose one guess for several boards within a time budget (seconds), reporting progress to an optional callback
+    def choose_multi_board_guess_with_deadline(self, candidate_masks, time_budget, progress_callback=None):
+        solved_guess = self.get_multi_board_solved_guess(candidate_masks)
+        if solved_guess is not None:
+            return solved_guess
+
+        for progress in self.generate_anytime_multi_board_guesses(candidate_masks, time_budget):
+            if progress_callback is not None:
+                progress_callback(*progress)
+        return progress[0]
+
     def choose_best_guess(self, expected_information_dict):
         return max(expected_information_dict, key=expected_information_dict.get)
 
     def simulate_game(self, target_word):
-        possible_words = ALLOWED_WORDS
+        pattern_matrix = self.get_pattern_matrix()
+        candidate_mask = self.get_initial_candidate_mask()
+        guess_history = []
+        entropy_engine = None  # Created the first time a guess has to be scored, then updated to each narrowed mask
         attempts = 0
         guessed_correctly = False
-        first_guess = "tares"
+        first_guess = self.get_opening_guess()
         
         guess = first_guess
         attempts += 1
@@ -105,19 +423,29 @@ class EntropyMaximisationAgent:
         if guess == target_word:
             return True, attempts
         else:
-            guess_pattern = self.get_coded_guess_pattern(guess, target_word)
-            possible_words = [word for word in possible_words if self.get_coded_guess_pattern(guess, word) == guess_pattern]
+            first_guess_pattern_code = pattern_matrix.get_pattern_code(guess, target_word)
+            candidate_mask = self.narrow_candidate_mask(candidate_mask, guess, first_guess_pattern_code)
+            guess_history.append((guess, first_guess_pattern_code))
 
         while not guessed_correctly and attempts < 6:
-            expected_information_dict = self.generate_expected_information_dictionary(possible_words)
-            guess = self.choose_best_guess(expected_information_dict)
+            guess = self.get_tree_guess(guess_history)
+            if guess is None and attempts == 1:
+                guess = self.get_second_guess(first_guess, first_guess_pattern_code)
+            if guess is None:
+                if self.use_incremental_entropy:
+                    if entropy_engine is None:
+                        entropy_engine = self.create_incremental_entropy_engine(candidate_mask)
+                    else:
+                        entropy_engine.update(candidate_mask)
+                guess = self.choose_guess_from_mask(candidate_mask, self.get_legal_guess_mask(guess_history), entropy_engine)
             attempts += 1
 
             if guess == target_word:
                 guessed_correctly = True
             else:
-                guess_pattern = self.get_coded_guess_pattern(guess, target_word)
-                possible_words = [word for word in possible_words if self.get_coded_guess_pattern(guess, word) == guess_pattern]
+                pattern_code = pattern_matrix.get_pattern_code(guess, target_word)
+                candidate_mask = self.narrow_candidate_mask(candidate_mask, guess, pattern_code)
+                guess_history.append((guess, pattern_code))
 
         return guessed_correctly, attempts
     
@@ -126,7 +454,8 @@ class EntropyMaximisationAgent:
         total_attempts = 0
 
         for _ in range(num_games):
-            target_word = ALLOWED_WORDS[generate_random_number(0, len(ALLOWED_WORDS))]
+            target_words = get_possible_answers_lexicon().words if self.use_answer_pool else get_allowed_words_lexicon().words
+            target_word = target_words[generate_random_number(1663, 123, len(target_words))]
             
             guessed_correctly, attempts = self.simulate_game(target_word)
             if guessed_correctly:
@@ -0,0 +1,58 @@
+from itertools import product
+from word_feedback import get_feedback_code, encode_coded_guess_pattern, decode_pattern_code, NUM_PATTERNS, ALL_GREEN_PATTERN_CODE
+from pattern_matrix import compute_pattern_matrix
+from packed_words import pack_words
+from wordle_bot import get_pattern_matrix
+import numpy as np
+import pytest
+
+# Every five-letter word over {a, b, c}, which covers every arrangement of repeated letters
+SMALL_ALPHABET_WORDS = ["".join(letters) for letters in product("abc", repeat=5)]
+
+# Function to work out feedback the way the original game did: greens first, then yellows left to right from the unused target letters
+def get_reference_pattern(guess, target_word):
+    pattern = ["B"] * len(guess)
+    remaining_letters = list(target_word)
+    for i, letter in enumerate(guess):
+        if letter == target_word[i]:
+            pattern[i] = "G"
+            remaining_letters[i] = None
+    for i, letter in enumerate(guess):
+        if pattern[i] != "G" and letter in remaining_letters:
+            pattern[i] = "Y"
+            remaining_letters[remaining_letters.index(letter)] = None
+    return "".join(pattern)
+
+def test_matches_reference_for_every_small_alphabet_pair():
+    for guess, target_word in product(SMALL_ALPHABET_WORDS, repeat=2):
+        assert "".join(decode_pattern_code(get_feedback_code(guess, target_word))) == get_reference_pattern(guess, target_word), (guess, target_word)
+
+@pytest.mark.parametrize("guess, target_word, expected_pattern", [
+    ("speed", "abide", "BBYBY"),  # Only one E in the target, so only the first E is yellow
+    ("llama", "hello", "YYBBB"),  # Both Ls are yellow, as the target has two
+    ("hello", "llama", "BBYYB"),
+    ("eerie", "there", "YBYBG"),  # The green E uses up one of the target's two Es
+    ("abbey", "kebab", "YYGYB"),
+    ("geese", "eerie", "BGYBG"),
+    ("crane", "crane", "GGGGG"),
+])
+def test_repeated_letter_cases(guess, target_word, expected_pattern):
+    assert get_reference_pattern(guess, target_word) == expected_pattern
+    assert get_feedback_code(guess, target_word) == encode_coded_guess_pattern(expected_pattern)
+
+def test_pattern_codes_round_trip():
+    for pattern_code in range(NUM_PATTERNS):
+        assert encode_coded_guess_pattern(decode_pattern_code(pattern_code)) == pattern_code
+    assert get_feedback_code("crane", "crane") == ALL_GREEN_PATTERN_CODE
+
+def test_vectorised_matrix_matches_feedback_codes():
+    packed_words = pack_words(SMALL_ALPHABET_WORDS)
+    matrix = compute_pattern_matrix(packed_words, packed_words)
+    expected_matrix = np.array([[get_feedback_code(guess, target_word) for target_word in SMALL_ALPHABET_WORDS] for guess in SMALL_ALPHABET_WORDS])
+    np.testing.assert_array_equal(matrix, expected_matrix)
+
+@pytest.mark.parametrize("guess", ["speed", "llama", "eerie", "abbey", "tares"])
+def test_cached_matrix_rows_match_feedback_codes(guess):
+    pattern_matrix = get_pattern_matrix()
+    expected_row = [get_feedback_code(guess, target_word) for target_word in pattern_matrix.target_words]
+    np.testing.assert_array_equal(pattern_matrix.matrix[pattern_matrix.guess_index[guess]], expected_row)